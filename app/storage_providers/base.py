@@ -71,6 +71,12 @@ class BaseStorageProvider(ABC):
     def preview_file(self, file: dict):
         """Preview file content"""
 
+    def prefetch_previews(self, files: List[dict]) -> None:
+        """Start loading preview content for files that are about to be rendered
+
+        Optional; providers whose previews are slow to fetch can override this.
+        """
+
     def get_scan_success_msg(self, duplicate_groups: int, duplicate_files: int) -> str:  # pylint: disable=unused-argument
         """Returns custom success message after scan completion
 
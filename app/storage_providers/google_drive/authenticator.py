@@ -5,16 +5,19 @@ including token generation, refresh, and validation.
 """
 
 import logging
-import os
 from abc import ABC
 
 import streamlit as st
-from googleapiclient.discovery import build
 
-from .google_utils import GoogleService, TOKEN_FILE
+from .google_utils import (
+    GoogleService, auth_files_present, build_service, credentials_fingerprint, save_token_file
+)
 
 logger = logging.getLogger(__name__)
 
+# Session-state key for the signed-in user's profile, fetched once per credential
+USER_INFO_KEY = 'gdrive_user_info'
+
 
 class GoogleAuthenticator(ABC):
     """Handles Google Drive OAuth2 authentication and user info retrieval."""
@@ -61,7 +64,6 @@ class GoogleAuthenticator(ABC):
 
                     if success:
                         st.success("🎉 Authentication successful!")
-                        st.balloons()
                         st.session_state.gdrive_auth_flow = False
                         return True
                     st.error(f"❌ Authentication failed: {error}")
@@ -72,7 +74,8 @@ class GoogleAuthenticator(ABC):
 
     def _handle_authentication_flow(self):
         """Handle authentication UI and logic."""
-        if not os.path.exists(TOKEN_FILE):
+        _, token_present = auth_files_present()
+        if not token_present:
             st.info("🔐 **Easy Authentication Setup**")
             if 'gdrive_auth_flow' not in st.session_state:
                 st.session_state.gdrive_auth_flow = False
@@ -95,8 +98,8 @@ class GoogleAuthenticator(ABC):
                 )
                 if uploaded_token is not None:
                     try:
-                        with open(TOKEN_FILE, 'wb') as f:
-                            f.write(uploaded_token.getbuffer())
+                        uploaded_token.seek(0)
+                        save_token_file(uploaded_token)
                         st.success("Token file uploaded successfully!")
                         st.rerun()
                     except Exception as e:
@@ -114,9 +117,21 @@ class GoogleAuthenticator(ABC):
         return True
 
     def _get_user_info(self):
+        """Get user information, cached in session state for the current credentials"""
+        credentials_key = credentials_fingerprint(self.google_service.credentials)
+        cached = st.session_state.get(USER_INFO_KEY)
+        if cached and cached['key'] == credentials_key:
+            return cached['info']
+
+        user_info = self._fetch_user_info()
+        if user_info:
+            st.session_state[USER_INFO_KEY] = {'key': credentials_key, 'info': user_info}
+        return user_info
+
+    def _fetch_user_info(self):
         """Get user information from Google Drive API"""
         def get_drive_api_info():
-            about = self.google_service.service.about().get(fields="user").execute()
+            about = self.google_service.service.about().get(fields="user(displayName,emailAddress,photoLink)").execute()
             user = about.get('user', {})
             return {
                 'name': user.get('displayName', 'Unknown User'),
@@ -125,8 +140,8 @@ class GoogleAuthenticator(ABC):
             }
 
         def get_oauth2_info():
-            userinfo_service = build('oauth2', 'v2', credentials=self.google_service.credentials)
-            user_info = userinfo_service.userinfo().get().execute()
+            userinfo_service = build_service('oauth2', 'v2', self.google_service.credentials)
+            user_info = userinfo_service.userinfo().get(fields="name,email,picture").execute()
             return {
                 'name': user_info.get('name', 'Unknown User'),
                 'email': user_info.get('email', 'Unknown Email'),
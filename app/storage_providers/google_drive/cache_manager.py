@@ -1,39 +1,146 @@
 """Cache manager for Google Drive files."""
+import hashlib
+import os
 import sqlite3
 import json
+import threading
 import time
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
 import logging
-from typing import Union
+from typing import Callable, Union
+
+try:
+    import orjson  # Optional; C-implemented and several times faster than json for cache payloads
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 CACHE_DIR = '.local/.cache'  # Default cache directory
+IN_QUERY_CHUNK_SIZE = 900  # Stays under SQLite's default limit on bound parameters
+COMPRESSION_LEVEL = 3  # zlib level; low levels already shrink repetitive listing JSON several times
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+PAGE_CACHE_KIB = 64 * 1024  # Negative cache_size values are in KiB
+SWEEP_INTERVAL_SECONDS = 15 * 60  # Expired rows are removed in periodic sweeps, not on lookup
+DETAILS_RETENTION_HOURS = 7 * 24  # Stale file details stay servable this long
+
+UNCHANGED_DETAILS_REFRESH_SECONDS = 3600  # Unchanged details only get a new timestamp this often
+
+_sweep_lock = threading.Lock()
+_last_sweep: float | None = None
+_drive_caches: dict[str, 'DriveCache'] = {}
+_initialized_dbs: set[str] = set()  # Database paths whose schema was set up by this process
+_init_db_lock = threading.Lock()
+_drive_caches_lock = threading.Lock()
+
+
+def _pack(data) -> bytes:
+    """Serialise cached metadata to compact, compressed JSON"""
+    if orjson is not None:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(payload, COMPRESSION_LEVEL)
+
+
+def _unpack(blob):
+    """Inverse of _pack; rows written before compression was added hold plain JSON text"""
+    payload = blob if isinstance(blob, str) else zlib.decompress(blob)
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+
+def _file_details_row(file_info: dict, timestamp: int) -> tuple:
+    """Build a file_details row; Drive reports size as a string and omits it for folders"""
+    size = file_info.get('size')
+    meta_data = _pack(file_info)
+    return (
+        file_info['id'], meta_data, zlib.crc32(meta_data), timestamp,
+        file_info.get('mimeType'), int(size) if size is not None else None
+    )
+
+
+# Rewriting byte-identical details only churns pages and WAL frames, so an unchanged row is
+# left alone unless its timestamp needs refreshing to keep the entry from expiring
+_UPSERT_FILE_DETAILS_SQL = f"""
+    INSERT INTO file_details (
+        file_id, meta_data, meta_hash, timestamp, mime_type, size
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (file_id) DO UPDATE SET
+        meta_data = excluded.meta_data, meta_hash = excluded.meta_hash, timestamp = excluded.timestamp,
+        mime_type = excluded.mime_type, size = excluded.size
+    WHERE file_details.meta_hash IS NOT excluded.meta_hash
+        OR file_details.timestamp < excluded.timestamp - {UNCHANGED_DETAILS_REFRESH_SECONDS}
+"""
+
 
 class DriveCache:
     def __init__(self, cache_dir: str = CACHE_DIR):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.db_path = self.cache_dir / "gdrive_cache.db"
+        self.media_dir = self.cache_dir / "media"  # Media content, stored by SHA-1 outside the database
+        self._local = threading.local()
         self._init_db()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use and kept for the thread's lifetime
+
+        Use get_drive_cache() so every rerun shares one instance and its connections.
+        Threads (reruns, prefetch workers, background refreshes) each get their own
+        connection so WAL lets them read in parallel instead of queueing on one.
+        Autocommit mode, so each statement is its own transaction unless grouped.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # Cache probes are read-heavy; serve pages from a memory map and a larger page cache
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+            conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_KIB}")
+        return conn
+
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
+        # Schema setup and migrations only need to run once per process for each database
+        db_key = str(self.db_path.resolve())
+        with _init_db_lock:
+            if db_key in _initialized_dbs:
+                return
+            conn = self._conn
+            # WAL avoids fsyncing a rollback journal on every write and lets readers run alongside writers.
+            # The journal mode is stored in the database file, so setting it once covers every connection
+            conn.execute("PRAGMA journal_mode=WAL")
+
             # Table for file contents cache
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS file_cache (
                     folder_id TEXT,
                     is_recursive INTEGER,
-                    files_data TEXT,
+                    files_data BLOB,
                     timestamp INTEGER,
                     PRIMARY KEY (folder_id, is_recursive)
                 )
             """)
+            # The primary key already serves lookups, and they read files_data anyway
+            conn.execute("DROP INDEX IF EXISTS idx_file_cache_age")
 
             # Table for subfolder relationships with JSON storage
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS folder_cache (
                     parent_id TEXT PRIMARY KEY,
-                    sub_folders TEXT,  -- Stores subfolders data as JSON
+                    sub_folders BLOB,  -- Stores subfolders data as compressed JSON
+                    timestamp INTEGER
+                )
+            """)
+
+            # Table for folder names and parents, used to resolve paths without the API
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS folder_parents (
+                    folder_id TEXT PRIMARY KEY,
+                    name TEXT,
+                    parent_id TEXT,
                     timestamp INTEGER
                 )
             """)
@@ -42,183 +149,314 @@ class DriveCache:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS file_details (
                     file_id TEXT PRIMARY KEY,
-                    meta_data TEXT NOT NULL,  -- Stores all file metadata as JSON
+                    meta_data BLOB NOT NULL,  -- Stores all file metadata as compressed JSON
                     timestamp INTEGER,
+                    mime_type TEXT,  -- Copied out of meta_data so filters need not decode it
+                    size INTEGER,
+                    meta_hash INTEGER,  -- CRC-32 of meta_data, to skip rewriting unchanged details
                     FOREIGN KEY (file_id) REFERENCES file_cache(folder_id)
                 )
             """)
+            # meta_data is compressed, so json_extract generated columns cannot read it;
+            # the hot fields are written alongside it instead. Add them to older databases
+            detail_columns = {row[1] for row in conn.execute("PRAGMA table_info(file_details)")}
+            for column, column_type in (('mime_type', 'TEXT'), ('size', 'INTEGER'), ('meta_hash', 'INTEGER')):
+                if column not in detail_columns:
+                    conn.execute(f"ALTER TABLE file_details ADD COLUMN {column} {column_type}")
+            # Nothing filters on mime_type yet, so the index only slowed every upsert
+            conn.execute("DROP INDEX IF EXISTS idx_file_details_mime")
+
+            # Media used to be stored inline; those rows are only a cache, so drop the old table
+            media_columns = {row[1] for row in conn.execute("PRAGMA table_info(media_storage)")}
+            if 'media_blob' in media_columns:
+                conn.execute("DROP TABLE media_storage")
 
-            # Table for media storage
+            # Table for media storage; the content lives in the media directory
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS media_storage (
                     file_id TEXT PRIMARY KEY,
                     media_type TEXT,  -- MIME type of the media (nullable)
-                    media_blob BLOB NOT NULL,  -- The actual media content
+                    media_path TEXT NOT NULL,  -- Content file under the media directory
+                    media_sha1 TEXT NOT NULL,
+                    media_size INTEGER,
                     timestamp INTEGER,
                     FOREIGN KEY (file_id) REFERENCES file_details(file_id)
                 )
             """)
+            _initialized_dbs.add(db_key)
 
-    def get_cached_files(self, folder_id: str, recursive: bool, max_age_hours: int = 24):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT files_data, timestamp FROM file_cache
-                WHERE folder_id = ? AND is_recursive = ?
-                """,
-                (folder_id, int(recursive))
+    def sweep_expired(self, max_age_hours: int = 24):
+        """Delete expired rows from every table in one transaction, and unreferenced media files
+
+        File details are kept for DETAILS_RETENTION_HOURS so expired ones can still
+        be served while they are refreshed.
+        """
+        now = time.time()
+        cutoff = now - max_age_hours * 3600
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM file_cache WHERE timestamp < ?", (cutoff,))
+            conn.execute("DELETE FROM folder_cache WHERE timestamp < ?", (cutoff,))
+            conn.execute("DELETE FROM folder_parents WHERE timestamp < ?", (cutoff,))
+            conn.execute(
+                "DELETE FROM file_details WHERE timestamp < ?", (now - DETAILS_RETENTION_HOURS * 3600,)
             )
-            result = cursor.fetchone()
+            expired_media = conn.execute(
+                "SELECT DISTINCT media_path, media_sha1 FROM media_storage WHERE timestamp < ?", (cutoff,)
+            ).fetchall()
+            conn.execute("DELETE FROM media_storage WHERE timestamp < ?", (cutoff,))
+            # Content is shared by files with identical media; keep it while any row still points at it
+            orphaned_paths = [
+                media_path for media_path, media_sha1 in expired_media
+                if conn.execute(
+                    "SELECT 1 FROM media_storage WHERE media_sha1 = ? LIMIT 1", (media_sha1,)
+                ).fetchone() is None
+            ]
+        for media_path in orphaned_paths:
+            Path(media_path).unlink(missing_ok=True)
+        logger.debug("Swept expired cache entries and %d media files", len(orphaned_paths))
+
+    def _maybe_sweep(self):
+        """Start a background sweep if none has run in this process for SWEEP_INTERVAL_SECONDS"""
+        global _last_sweep
+        with _sweep_lock:
+            if _last_sweep is not None and time.monotonic() - _last_sweep < SWEEP_INTERVAL_SECONDS:
+                return
+            _last_sweep = time.monotonic()
+        threading.Thread(target=self.sweep_expired, daemon=True, name='gdrive-cache-sweep').start()
 
-            if result:
-                files_data, timestamp = result
-                age_hours = (time.time() - timestamp) / 3600
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements as one write transaction on this thread's connection"""
+        conn = self._conn
+        # Take the write lock up front so another connection cannot make the upgrade fail
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
-                if age_hours < max_age_hours:
-                    logger.debug(f"Cache hit for folder {folder_id}")
-                    return json.loads(files_data)
+    def _executemany(self, sql: str, rows: list):
+        """Write many rows in one transaction so a batch costs a single commit"""
+        if not rows:
+            return
+        with self._transaction() as conn:
+            conn.executemany(sql, rows)
+
+    def get_cached_files(self, folder_id: str, recursive: bool, max_age_hours: int = 24):
+        conn = self._conn
+        cursor = conn.execute(
+            """
+            SELECT files_data, timestamp FROM file_cache
+            WHERE folder_id = ? AND is_recursive = ?
+            """,
+            (folder_id, int(recursive))
+        )
+        result = cursor.fetchone()
+
+        if result:
+            files_data, timestamp = result
+            age_hours = (time.time() - timestamp) / 3600
+
+            if age_hours < max_age_hours:
+                logger.debug("Cache hit for folder %s", folder_id)
+                return _unpack(files_data)
 
         return None
 
     def cache_files(self, folder_id: str, recursive: bool, files: list):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO file_cache (folder_id, is_recursive, files_data, timestamp)
-                VALUES (?, ?, ?, ?)
-                """,
-                (folder_id, int(recursive), json.dumps(files), int(time.time()))
-            )
+        conn = self._conn
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO file_cache (folder_id, is_recursive, files_data, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            (folder_id, int(recursive), _pack(files), int(time.time()))
+        )
+
+    def cache_files_bulk(self, files_by_folder: dict[str, list], recursive: bool):
+        """Cache the file listings of several folders in one transaction"""
+        current_time = int(time.time())
+        self._executemany(
+            """
+            INSERT OR REPLACE INTO file_cache (folder_id, is_recursive, files_data, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (folder_id, int(recursive), _pack(files), current_time)
+                for folder_id, files in files_by_folder.items()
+            ]
+        )
 
     def get_cached_subfolders(self, parent_id: str, max_age_hours: int = 24):
         """Get cached subfolders for a parent folder if available and not expired"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT sub_folders, timestamp
-                FROM folder_cache
-                WHERE parent_id = ?
-                """,
-                (parent_id,)
-            )
-            result = cursor.fetchone()
-            logger.debug("result of cached subfolders query: %s", result)
-
-            if result:
-                logger.debug("Found cached subfolders for parent ID: %s", parent_id)
-                sub_folders, timestamp = result
-                age_hours = (time.time() - timestamp) / 3600
-
-                if age_hours < max_age_hours:
-                    logger.debug(f"Cache hit for subfolders of {parent_id}")
-                    return json.loads(sub_folders)
-                else:
-                    # Clean up expired entry
-                    conn.execute(
-                        "DELETE FROM folder_cache WHERE parent_id = ?",
-                        (parent_id,)
-                    )
+        conn = self._conn
+        cursor = conn.execute(
+            """
+            SELECT sub_folders, timestamp
+            FROM folder_cache
+            WHERE parent_id = ?
+            """,
+            (parent_id,)
+        )
+        result = cursor.fetchone()
+
+        if result:
+            sub_folders, timestamp = result
+            age_hours = (time.time() - timestamp) / 3600
+
+            if age_hours < max_age_hours:
+                logger.debug("Cache hit for subfolders of %s", parent_id)
+                return _unpack(sub_folders)
 
         return None
 
-    def cache_subfolders(self, parent_id: str, subfolders: list):
-        """Cache subfolder information for a parent folder"""
-        logger.debug(f"Caching subfolders for parent ID: {parent_id}")
+    def cache_subfolders_bulk(self, subfolders_by_parent: dict[str, list]):
+        """Cache the subfolders of several parent folders in one transaction"""
+        logger.debug("Caching subfolders for %d parent folders", len(subfolders_by_parent))
         current_time = int(time.time())
-        # Filter only folder items and prepare them for storage
-        folder_data = [
-            {
-                'id': folder['id'],
-                'name': folder['name'],
-                'mimeType': folder['mimeType']
-            }
-            for folder in subfolders
-            if folder.get('mimeType') == 'application/vnd.google-apps.folder'
-        ]
-
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO folder_cache
-                (parent_id, sub_folders, timestamp)
-                VALUES (?, ?, ?)
-                """,
-                (parent_id, json.dumps(folder_data), current_time)
-            )
+        rows = []
+        for parent_id, subfolders in subfolders_by_parent.items():
+            # Filter only folder items and prepare them for storage
+            folder_data = [
+                {
+                    'id': folder['id'],
+                    'name': folder['name'],
+                    'mimeType': folder['mimeType']
+                }
+                for folder in subfolders
+                if folder.get('mimeType') == 'application/vnd.google-apps.folder'
+            ]
+            rows.append((parent_id, _pack(folder_data), current_time))
 
-    def get_cached_file_details(self, file_id: str, max_age_hours: int = 24) -> Union[dict, None]:
-        """Get cached details for a specific file if available and not expired"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT meta_data, timestamp
-                FROM file_details
-                WHERE file_id = ?
-                """,
-                (file_id,)
-            )
-            result = cursor.fetchone()
-
-            if result:
-                meta_data, timestamp = result
-                age_hours = (time.time() - timestamp) / 3600
-
-                if age_hours < max_age_hours:
-                    logger.debug(f"Cache hit for file {file_id}")
-                    return json.loads(meta_data)
-                else:
-                    # Clean up expired entry
-                    conn.execute("DELETE FROM file_details WHERE file_id = ?", (file_id,))
-                    conn.execute("DELETE FROM media_storage WHERE file_id = ?", (file_id,))
+        self._executemany(
+            """
+            INSERT OR REPLACE INTO folder_cache
+            (parent_id, sub_folders, timestamp)
+            VALUES (?, ?, ?)
+            """,
+            rows
+        )
+
+    def get_cached_folder_parent(self, folder_id: str, max_age_hours: int = 24) -> Union[tuple, None]:
+        """Get a folder's cached (name, parent ID) if available and not expired"""
+        conn = self._conn
+        return conn.execute(
+            "SELECT name, parent_id FROM folder_parents WHERE folder_id = ? AND timestamp > ?",
+            (folder_id, time.time() - max_age_hours * 3600)
+        ).fetchone()
+
+    def cache_folder_parents(self, folder_parents: dict[str, tuple]):
+        """Cache (name, parent ID) for many folders in one transaction"""
+        current_time = int(time.time())
+        self._executemany(
+            """
+            INSERT OR REPLACE INTO folder_parents (folder_id, name, parent_id, timestamp)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (folder_id, name, parent_id, current_time)
+                for folder_id, (name, parent_id) in folder_parents.items()
+            ]
+        )
+
+    def get_cached_file_details(self, file_id: str, max_age_hours: int = 24,
+                                on_stale: Union[Callable[[str], None], None] = None) -> Union[dict, None]:
+        """Get cached details for a specific file if available and not expired
+
+        With on_stale, an expired entry is returned as well and on_stale(file_id)
+        is called so the caller can refresh it in the background.
+        """
+        conn = self._conn
+        cursor = conn.execute(
+            """
+            SELECT meta_data, timestamp
+            FROM file_details
+            WHERE file_id = ?
+            """,
+            (file_id,)
+        )
+        result = cursor.fetchone()
+
+        if result:
+            meta_data, timestamp = result
+            age_hours = (time.time() - timestamp) / 3600
+
+            if age_hours < max_age_hours:
+                logger.debug("Cache hit for file %s", file_id)
+                return _unpack(meta_data)
+            elif on_stale is not None:
+                logger.debug("Serving stale details for file %s", file_id)
+                on_stale(file_id)
+                return _unpack(meta_data)
 
         return None
 
     def cache_file_details(self, file_info: dict):
         """Cache details for a single file"""
-        if file_info.get('mimeType') != 'application/vnd.google-apps.folder':
-            logger.debug("Caching file details for folder: %s",file_info['id'])
-            logger.debug("folder name: %s", file_info.get('name', 'Unknown'))
+        logger.debug("Caching file details for %s", file_info['id'])
         current_time = int(time.time())
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO file_details (
-                    file_id, meta_data, timestamp
-                ) VALUES (?, ?, ?)
-                """,
-                (
-                    file_info['id'],
-                    json.dumps(file_info),
-                    current_time
-                )
-            )
+        conn = self._conn
+        conn.execute(_UPSERT_FILE_DETAILS_SQL, _file_details_row(file_info, current_time))
 
     def get_cached_media(self, file_id: str, max_age_hours: int = 24) -> Union[bytes, None]:
         """Get cached media content for a specific file if available and not expired"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT media_type, media_blob, timestamp
-                FROM media_storage
-                WHERE file_id = ?
-                """,
-                (file_id,)
-            )
-            result = cursor.fetchone()
+        conn = self._conn
+        cursor = conn.execute(
+            """
+            SELECT media_path, timestamp
+            FROM media_storage
+            WHERE file_id = ?
+            """,
+            (file_id,)
+        )
+        result = cursor.fetchone()
 
-            if result:
-                media_type, media_blob, timestamp = result
-                age_hours = (time.time() - timestamp) / 3600
+        if result:
+            media_path, timestamp = result
+            age_hours = (time.time() - timestamp) / 3600
 
-                if age_hours < max_age_hours:
-                    logger.debug(f"Cache hit for media {file_id}")
-                    return media_blob
-                else:
-                    # Clean up expired entry
+            if age_hours < max_age_hours:
+                try:
+                    media_content = Path(media_path).read_bytes()
+                    logger.debug("Cache hit for media %s", file_id)
+                    return media_content
+                except FileNotFoundError:
+                    # The content file was removed from disk; forget the row too
                     conn.execute("DELETE FROM media_storage WHERE file_id = ?", (file_id,))
 
         return None
 
+    def cached_media_ids(self, file_ids: list[str], max_age_hours: int = 24) -> set[str]:
+        """Return which of the given files have unexpired cached media, without reading blobs"""
+        cutoff = time.time() - max_age_hours * 3600
+        cached = set()
+        conn = self._conn
+        for start in range(0, len(file_ids), IN_QUERY_CHUNK_SIZE):
+            chunk = file_ids[start:start + IN_QUERY_CHUNK_SIZE]
+            cursor = conn.execute(
+                f"""
+                SELECT file_id FROM media_storage
+                WHERE file_id IN ({','.join('?' * len(chunk))}) AND timestamp > ?
+                """,
+                (*chunk, cutoff)
+            )
+            cached.update(file_id for file_id, in cursor)
+        return cached
+
+    def _store_media(self, media_content: bytes) -> tuple[str, str, int]:
+        """Write media to its content address and return (path, sha1, size); identical content is stored once"""
+        media_sha1 = hashlib.sha1(media_content, usedforsecurity=False).hexdigest()
+        media_path = self.media_dir / media_sha1[:2] / media_sha1
+        if not media_path.exists():
+            media_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = media_path.with_name(f"{media_sha1}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(media_content)
+            # Readers only ever see a complete file
+            os.replace(tmp_path, media_path)
+        return str(media_path), media_sha1, len(media_content)
+
     def cache_media(self, file_id: str, media_type: str | None, media_content: bytes):
         """
         Cache media content for a file
@@ -229,12 +467,24 @@ class DriveCache:
             media_content: The actual media content as bytes
         """
         current_time = int(time.time())
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO media_storage (
-                    file_id, media_type, media_blob, timestamp
-                ) VALUES (?, ?, ?, ?)
-                """,
-                (file_id, media_type, media_content, current_time)
-            )
+        media_path, media_sha1, media_size = self._store_media(media_content)
+        conn = self._conn
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO media_storage (
+                file_id, media_type, media_path, media_sha1, media_size, timestamp
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (file_id, media_type, media_path, media_sha1, media_size, current_time)
+        )
+
+
+def get_drive_cache(cache_dir: str = CACHE_DIR) -> DriveCache:
+    """Return the process-wide DriveCache for a cache directory, creating it on first use"""
+    with _drive_caches_lock:
+        drive_cache = _drive_caches.get(cache_dir)
+        if drive_cache is None:
+            drive_cache = _drive_caches[cache_dir] = DriveCache(cache_dir)
+    # Called on every rerun; sweeps themselves are throttled to SWEEP_INTERVAL_SECONDS
+    drive_cache._maybe_sweep()
+    return drive_cache
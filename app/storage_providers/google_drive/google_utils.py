@@ -1,24 +1,274 @@
 import os
+import functools
+import hashlib
+import io
+import json
 import logging
-import requests
-
-from typing import Union
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, BinaryIO, Union
+import httplib2
 import streamlit as st
-from google_auth_oauthlib.flow import InstalledAppFlow
+from google_auth_httplib2 import AuthorizedHttp
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.model import JsonModel
 
 from app.utils import format_iso_timestamp, human_readable_size, get_file_extension
+from .cache_manager import get_drive_cache
+
+try:
+    import orjson  # Optional; parses Drive's JSON responses several times faster than json
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from google_auth_oauthlib.flow import InstalledAppFlow
 
 logger = logging.getLogger(__name__)
 
 # credentials_file
 CREDENTIALS_FILE = '.local/credentials.json'
 TOKEN_FILE = '.local/token.json'
+TOKEN_COPY_CHUNK_SIZE = 64 * 1024
 SCOPES = [
     'https://www.googleapis.com/auth/drive.readonly',
     'https://www.googleapis.com/auth/drive',
     ]
+AUTH_FLOW_KEY = '_gdrive_auth_flow'  # Pending OAuth flow and its authorization URL
+SERVICES_KEY = '_gdrive_services'  # API clients built for this session, keyed by credentials
+TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+FOLDER_LIST_TTL_SECONDS = 300
+AUTH_FILES_TTL_SECONDS = 30  # Short enough to notice files added outside the app
+MAX_PAGE_SIZE = 1000  # Largest pageSize accepted by files.list
+PARENTS_PER_QUERY = 50  # Folder IDs OR-ed together in one files.list query
+MAX_BATCH_REQUESTS = 100  # Calls Google accepts in one batch HTTP request
+MAX_LISTING_WORKERS = 4  # Concurrent batch listings; stays well under Drive's read quota
+# Uncached folders listed before their files are handed to the caller; fills every worker's batch
+FOLDERS_PER_SLAB = PARENTS_PER_QUERY * MAX_BATCH_REQUESTS * MAX_LISTING_WORKERS
+CACHE_WRITE_BATCH_SIZE = 500  # Folder listings written per cache transaction
+MEDIA_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Bytes per ranged request when downloading media
+MEDIA_PREFETCH_WORKERS = 4
+DETAIL_REFRESH_WORKERS = 2  # Background re-fetches of stale file details
+MEDIA_PREFETCH_WAIT_SECONDS = 5  # How long a preview waits for an in-flight prefetch
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+# Per-item fields requested by listings; times and parents feed the file details and paths
+FILE_LIST_FIELDS = 'id,name,size,mimeType,md5Checksum,parents,createdTime,modifiedTime'
+# Single-file lookups also ask for the link the detail views show, but not every field ('*')
+FILE_DETAIL_FIELDS = f'{FILE_LIST_FIELDS},webViewLink'
+FOLDER_LIST_FIELDS = 'id,name'  # All the folder picker reads
+
+# Exclude Google Workspace files (Docs, Sheets, Slides, etc.)
+EXCLUDED_MIME_TYPES = (
+    'application/vnd.google-apps.document',
+    'application/vnd.google-apps.spreadsheet',
+    'application/vnd.google-apps.presentation',
+    'application/vnd.google-apps.form',
+    'application/vnd.google-apps.drawing',
+    'application/vnd.google-apps.site',
+)
+# Built once at import; Drive has no "not in" operator for mimeType
+EXCLUDED_MIMES_QUERY = "".join(f" and mimeType!='{mime}'" for mime in EXCLUDED_MIME_TYPES)
+# Shortcuts have no content or MD5 of their own; excluded unless the scan asks for them
+SHORTCUT_MIME_TYPE = 'application/vnd.google-apps.shortcut'
+SHORTCUTS_QUERY = f" and mimeType!='{SHORTCUT_MIME_TYPE}'"
+
+# Help shown for common OAuth errors, checked in order against the error text
+OAUTH_ERROR_MESSAGES = {
+    "access_denied": """
+🚫 **Access Denied - OAuth Consent Screen Issue**
+
+This error usually means your app is in testing mode and you need to add your email as a test user:
+
+**Fix Steps:**
+1. Go to [Google Cloud Console](https://console.cloud.google.com/)
+2. Select your project 'duplicate-file-finder-464317'
+3. Go to APIs & Services → OAuth consent screen
+4. Scroll to "Test users" section
+5. Click "+ ADD USERS"
+6. Add your email address
+7. Click Save and try again
+
+**Alternative:** You can also publish your OAuth consent screen to make it available to all users.
+""",
+    "invalid_grant": """
+⏰ **Invalid Grant - Code Expired**
+
+The authorization code has expired or was already used.
+
+**Fix:** Click the authorization link again to get a new code.
+""",
+    "invalid_request": """
+📝 **Invalid Request - Code Format Issue**
+
+The authorization code format is incorrect.
+
+**Fix:** Make sure you copied the complete authorization code from Google.
+""",
+}
+
+
+# Background media downloads for previews, shared across reruns and keyed by file ID
+_MEDIA_PREFETCH_POOL = ThreadPoolExecutor(max_workers=MEDIA_PREFETCH_WORKERS, thread_name_prefix='gdrive-prefetch')
+_media_prefetches: dict[str, Future] = {}
+# Kept for the process so worker threads, and their keep-alive connections, outlive a single scan
+_LISTING_POOL = ThreadPoolExecutor(max_workers=MAX_LISTING_WORKERS, thread_name_prefix='gdrive-listing')
+_thread_local = threading.local()
+# One worker so token writes land on disk in the order they were made
+_TOKEN_WRITE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gdrive-token')
+# Stale file details are re-fetched by a few workers however many a group needs
+_DETAIL_REFRESH_POOL = ThreadPoolExecutor(max_workers=DETAIL_REFRESH_WORKERS, thread_name_prefix='gdrive-refresh')
+# File IDs whose stale cached details are being refreshed in the background
+_detail_refreshes: set[str] = set()
+_detail_refreshes_lock = threading.Lock()
+
+
+def thread_authorized_http(credentials: Credentials) -> AuthorizedHttp:
+    """Return this thread's authorized connection for the given credentials
+
+    httplib2 connections are not thread-safe, so background threads cannot share the
+    service's; keeping one per thread still lets its calls reuse the open TLS session.
+    """
+    authorized_http = getattr(_thread_local, 'authorized_http', None)
+    if authorized_http is None or authorized_http.credentials is not credentials:
+        authorized_http = _thread_local.authorized_http = AuthorizedHttp(credentials, http=httplib2.Http())
+    return authorized_http
+
+
+def token_expires_soon(credentials: Credentials) -> bool:
+    """Return True if the access token is missing or expires within the refresh margin"""
+    if not credentials.token:
+        return True
+    if credentials.expiry is None:
+        return False
+    # google-auth keeps expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now < TOKEN_REFRESH_MARGIN
+
+
+def credentials_fingerprint(credentials: Credentials) -> str:
+    """Return a stable key identifying the account behind a set of credentials"""
+    identity = f"{credentials.client_id}:{credentials.refresh_token}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+
+@st.cache_data(ttl=AUTH_FILES_TTL_SECONDS, show_spinner=False)
+def auth_files_present() -> tuple[bool, bool]:
+    """Return whether the credentials and token files exist, cached briefly across reruns"""
+    return os.path.exists(CREDENTIALS_FILE), os.path.exists(TOKEN_FILE)
+
+
+def save_token_file(source: Union[str, BinaryIO]) -> None:
+    """Atomically replace the token file with token JSON text or a binary file's contents"""
+    tmp_path = f"{TOKEN_FILE}.tmp"
+    try:
+        with open(tmp_path, 'wb') as token:
+            if isinstance(source, str):
+                token.write(source.encode('utf-8'))
+            else:
+                shutil.copyfileobj(source, token, length=TOKEN_COPY_CHUNK_SIZE)
+            token.flush()
+            os.fsync(token.fileno())
+        if os.path.getsize(tmp_path) == 0:
+            raise ValueError("Token data is empty")
+        # A crash mid-write leaves the previous token intact instead of a truncated one
+        os.replace(tmp_path, TOKEN_FILE)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    auth_files_present.clear()
+
+
+def save_token_file_async(token_json: str) -> Future:
+    """Write token JSON on a background thread; the session already holds the credentials"""
+    future = _TOKEN_WRITE_POOL.submit(save_token_file, token_json)
+
+    def log_failure(done: Future):
+        if done.exception() is not None:
+            logger.error("Failed to save token file: %s", done.exception())
+
+    future.add_done_callback(log_failure)
+    return future
+
+
+@functools.lru_cache(maxsize=4)
+def _load_client_config(path: str, mtime: float) -> dict:
+    """Parse the OAuth client secrets; the mtime argument invalidates edited files"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def new_auth_flow() -> 'InstalledAppFlow':
+    """Create an OAuth flow from the (cached) client secrets file"""
+    # Imported here: oauthlib is only needed while signing in, not on every rerun
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    client_config = _load_client_config(CREDENTIALS_FILE, os.path.getmtime(CREDENTIALS_FILE))
+    flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
+    flow.redirect_uri = 'urn:ietf:wg:oauth:2.0:oob'  # For manual copy-paste flow
+    return flow
+
+
+class OrjsonModel(JsonModel):
+    """googleapiclient JSON model that parses response bodies with orjson"""
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Let the stock model handle (and report) bodies that are not JSON
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
+def _build_service(api_name: str, api_version: str, credentials: Credentials):
+    """Build a Google API service over its own (uncached) authorized HTTP client"""
+    # Use the discovery document bundled with googleapiclient instead of fetching it
+    authorized_http = AuthorizedHttp(credentials, http=httplib2.Http())
+    model = OrjsonModel() if orjson is not None else None  # None selects the stock JsonModel
+    return build(api_name, api_version, http=authorized_http, model=model,
+                 static_discovery=True, cache_discovery=False)
+
+
+def build_service(api_name: str, api_version: str, credentials: Credentials):
+    """Get the Google API service for the given credentials, reused across reruns of this session.
+
+    Services live in the session state rather than a process-wide resource cache, so one
+    session's httplib2 client is never shared with another. Work on other threads should
+    use thread_authorized_http instead.
+    """
+    key = (api_name, api_version, credentials_fingerprint(credentials))
+    services = st.session_state.setdefault(SERVICES_KEY, {})
+    if key not in services:
+        logger.debug("Building %s %s service for credentials %s", api_name, api_version, key[2][:8])
+        services[key] = _build_service(api_name, api_version, credentials)
+    return services[key]
+
+
+@st.cache_data(ttl=FOLDER_LIST_TTL_SECONDS, show_spinner=False)
+def _list_folders_cached(credentials_key: str, parent_folder_id: str, per_page: int, _google_service) -> list:
+    """First page of subfolders; cached so widget reruns do not hit the API
+
+    API errors propagate so that Streamlit does not cache them; the caller reports them.
+    """
+    logger.debug("Listing folders of %s for credentials %s", parent_folder_id, credentials_key[:8])
+    results = _google_service._list_children_request(
+        f"'{parent_folder_id}' in parents", per_page=per_page,
+        query=f"mimeType='{FOLDER_MIME_TYPE}'", fields=FOLDER_LIST_FIELDS
+    ).execute()
+    return results.get('files', [])
+
 
 class GoogleService():
     def __init__(self):
@@ -28,9 +278,9 @@ class GoogleService():
         self._setup_credentials()
         self.folder_id_to_path = {}  # Cache for folder ID to path mapping
         self.folder_path_to_id = {}  # Cache for folder paths to ID mapping
+        self.folder_name_and_parent = {}  # Cache for folder ID to (name, parent ID) mapping
         # Initialize drive cache for files
-        from .cache_manager import DriveCache
-        self.drive_cache = DriveCache()
+        self.drive_cache = get_drive_cache()
         self.root_folder_id = None  # Will be set after service is built
 
     def _setup_credentials(self):
@@ -43,26 +293,28 @@ class GoogleService():
 
     def _build_service(self):
         """Build Google Drive API service"""
-        try:
-            from googleapiclient.discovery import build
-            if self.credentials:
-                self.service = build('drive', 'v3', credentials=self.credentials)
-                return True
-        except ImportError:
-            return False
+        if self.credentials:
+            self.service = build_service('drive', 'v3', self.credentials)
+            return True
         return False
 
     def generate_auth_url(self):
         """Generate authentication URL for user to visit"""
         try:
-            if not os.path.exists(CREDENTIALS_FILE):
+            credentials_present, _ = auth_files_present()
+            if not credentials_present:
                 return None, "credentials.json file not found"
 
+            # Reuse the pending flow so reruns keep showing the same URL
+            pending_flow = st.session_state.get(AUTH_FLOW_KEY)
+            if pending_flow:
+                return pending_flow[1], None
+
             # Create flow
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
-            flow.redirect_uri = 'urn:ietf:wg:oauth:2.0:oob'  # For manual copy-paste flow
+            flow = new_auth_flow()
 
             auth_url, _ = flow.authorization_url(prompt='consent')
+            st.session_state[AUTH_FLOW_KEY] = (flow, auth_url)
             return auth_url, None
 
         except Exception as e:
@@ -71,21 +323,25 @@ class GoogleService():
     def exchange_code_for_token(self, auth_code):
         """Exchange authorization code for access token"""
         try:
-            # Create flow
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
-            flow.redirect_uri = 'urn:ietf:wg:oauth:2.0:oob'
+            # Use the flow that generated the authorization URL; it holds the PKCE verifier
+            pending_flow = st.session_state.get(AUTH_FLOW_KEY)
+            if pending_flow:
+                flow = pending_flow[0]
+            else:
+                flow = new_auth_flow()
 
             # Exchange code for token
             flow.fetch_token(code=auth_code)
             creds = flow.credentials
+            st.session_state.pop(AUTH_FLOW_KEY, None)
 
-            # Save token
-            with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
-                token.write(creds.to_json())
+            # Save token without holding up the rerun; the session state update below is what counts now
+            save_token_file_async(creds.to_json())
 
             # Update instance
             self.credentials = creds
             st.session_state.gdrive_credentials = creds
+            _list_folders_cached.clear()  # Drop listings cached for a previous login
 
             if self._build_service():
                 self.authenticated = True
@@ -96,64 +352,42 @@ class GoogleService():
             error_message = str(e)
 
             # Handle common OAuth errors with helpful messages
-            if "access_denied" in error_message:
-                return False, """
-🚫 **Access Denied - OAuth Consent Screen Issue**
-
-This error usually means your app is in testing mode and you need to add your email as a test user:
-
-**Fix Steps:**
-1. Go to [Google Cloud Console](https://console.cloud.google.com/)
-2. Select your project 'duplicate-file-finder-464317'
-3. Go to APIs & Services → OAuth consent screen
-4. Scroll to "Test users" section
-5. Click "+ ADD USERS"
-6. Add your email address
-7. Click Save and try again
-
-**Alternative:** You can also publish your OAuth consent screen to make it available to all users.
-"""
-            if "invalid_grant" in error_message:
-                return False, """
-⏰ **Invalid Grant - Code Expired**
-
-The authorization code has expired or was already used.
-
-**Fix:** Click the authorization link again to get a new code.
-"""
-            if "invalid_request" in error_message:
-                return False, """
-📝 **Invalid Request - Code Format Issue**
-
-The authorization code format is incorrect.
-
-**Fix:** Make sure you copied the complete authorization code from Google.
-"""
+            for error_code, help_message in OAUTH_ERROR_MESSAGES.items():
+                if error_code in error_message:
+                    return False, help_message
 
             return False, f"Authentication error: {error_message}"
 
     def authenticate(self) -> bool:
         """Check authentication status and return True if authenticated"""
 
-        # If already authenticated, return True
-        if self.authenticated and self.service:
+        # If already authenticated and the token is not about to expire, return True
+        if self.authenticated and self.service and not token_expires_soon(self.credentials):
             logger.debug("Already authenticated with Google Drive")
             return True
 
         # Check for credentials file
         logger.debug("Checking Google Drive credentials in file: %s", CREDENTIALS_FILE)
-        if not os.path.exists(CREDENTIALS_FILE):
+        credentials_present, token_present = auth_files_present()
+        if not credentials_present:
             logger.error("Google Drive credentials file not found: %s", CREDENTIALS_FILE)
             return False  # Setup required
 
         creds = None
 
-        # Load existing token
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        if self.authenticated and self.credentials:
+            # Session credentials are about to expire; refresh them below
+            creds = self.credentials
+        elif token_present:
+            # Load existing token; the presence check is cached, so the file may be gone or rewritten
+            try:
+                creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning("Could not load token file %s: %s", TOKEN_FILE, e)
+                auth_files_present.clear()
 
         # Check if credentials are valid
-        if creds and creds.valid:
+        if creds and creds.valid and not token_expires_soon(creds):
             # Save credentials and build service
             self.credentials = creds
             st.session_state.gdrive_credentials = creds
@@ -162,29 +396,40 @@ The authorization code format is incorrect.
                 self.authenticated = True
                 return True
 
-        # Try to refresh expired credentials
-        if creds and creds.expired and creds.refresh_token:
-            logger.debug("Refreshing expired Google Drive credentials")
+        # Try to refresh expired or expiring credentials
+        if creds and creds.refresh_token:
+            logger.debug("Refreshing expiring Google Drive credentials")
             try:
                 creds.refresh(Request())
                 self.credentials = creds
                 st.session_state.gdrive_credentials = creds
 
                 # Save refreshed token
-                with open(TOKEN_FILE, 'w') as token:
-                    token.write(creds.to_json())
+                save_token_file_async(creds.to_json())
 
                 if self._build_service():
                     self.authenticated = True
                     return True
             except Exception as e:
                 logger.error("Failed to refresh Google Drive credentials: %s", e)
-                if os.path.exists(TOKEN_FILE):
-                    try:
-                        os.remove(TOKEN_FILE)
-                        logger.warning("Deleted invalid token file: %s", TOKEN_FILE)
-                    except Exception as delete_error:
-                        logger.error("Failed to delete token file: %s", delete_error)
+                if creds.valid:
+                    # The current token still works; keep it and retry the refresh on a later rerun
+                    self.credentials = creds
+                    st.session_state.gdrive_credentials = creds
+                    if self._build_service():
+                        self.authenticated = True
+                        return True
+                self.authenticated = False
+                # Only a rejected refresh token means a new login is needed; network errors do not
+                if isinstance(e, RefreshError):
+                    st.session_state.pop('gdrive_credentials', None)
+                    if os.path.exists(TOKEN_FILE):
+                        try:
+                            os.remove(TOKEN_FILE)
+                            auth_files_present.clear()
+                            logger.warning("Deleted invalid token file: %s", TOKEN_FILE)
+                        except Exception as delete_error:
+                            logger.error("Failed to delete token file: %s", delete_error)
 
         logger.debug("Google Drive authentication failed")
         return False  # Not authenticated
@@ -196,45 +441,59 @@ The authorization code format is incorrect.
         logger.debug("Getting Google Drive file service")
         return self.service.files()
 
-    async def get_files(self, parent_folder_id: str, *, per_page: int = 100, page_token=None) -> tuple:
-        return await self.get_files_and_folders(
-            parent_folder_id, per_page=per_page, page_token=page_token,
-            query="not mimeType='application/vnd.google-apps.folder'"
+    async def get_files(self, parent_folder_id: str, *, per_page: int = MAX_PAGE_SIZE, page_token=None,
+                        exclude_shortcuts: bool = True) -> tuple:
+        return self._list_children(
+            f"'{parent_folder_id}' in parents",
+            per_page=per_page, page_token=page_token,
+            query=f"mimeType!='{FOLDER_MIME_TYPE}'", exclude_shortcuts=exclude_shortcuts
         )
 
-    async def get_folders(self, parent_folder_id: str, *, per_page: int = 100, page_token=None) -> tuple:
+    async def get_folders(self, parent_folder_id: str, *, per_page: int = MAX_PAGE_SIZE, page_token=None) -> tuple:
         return await self.get_files_and_folders(
             parent_folder_id, per_page=per_page, page_token=page_token,
-            query="mimeType='application/vnd.google-apps.folder'"
+            query=f"mimeType='{FOLDER_MIME_TYPE}'", fields=FOLDER_LIST_FIELDS
         )
 
-    async def get_files_and_folders(self, parent_folder_id: str, *, per_page: int = 100, page_token=None, query=None) -> tuple:
+    def get_folders_cached(self, parent_folder_id: str, *, per_page: int = MAX_PAGE_SIZE) -> list:
+        """Get the first page of subfolders, reusing results across Streamlit reruns"""
         try:
-            query_internal = f"'{parent_folder_id}' in parents and trashed=false"
-
-            # Exclude Google Workspace files (Docs, Sheets, Slides, etc.)
-            excluded_mimes = [
-                'application/vnd.google-apps.shortcut',
-                'application/vnd.google-apps.document',
-                'application/vnd.google-apps.spreadsheet',
-                'application/vnd.google-apps.presentation',
-                # 'application/vnd.google-apps.folder',
-                'application/vnd.google-apps.form',
-                'application/vnd.google-apps.drawing',
-                'application/vnd.google-apps.site'
-            ]
-
-            for mime in excluded_mimes:
-                query_internal += f" and not mimeType='{mime}'"
-
-            if query:
-                query_internal += f" and {query}"
+            return _list_folders_cached(credentials_fingerprint(self.credentials), parent_folder_id, per_page, self)
+        except Exception as e:
+            # Reported on this run only; the next rerun retries the API
+            st.error(f"Error fetching files: {e}")
+            return []
 
-            results = self.get_file_service().list(
-                q=query_internal,
-                pageSize=per_page,
-                pageToken=page_token,
-                fields="nextPageToken,files(id,name,size,mimeType,md5Checksum,parents,webViewLink,createdTime,modifiedTime)"
+    async def get_files_and_folders(self, parent_folder_id: str, *, per_page: int = MAX_PAGE_SIZE, page_token=None, query=None,
+                                    fields: str = FILE_LIST_FIELDS) -> tuple:
+        return self._list_children(
+            f"'{parent_folder_id}' in parents",
+            per_page=per_page, page_token=page_token, query=query, fields=fields
+        )
+
+    def _list_children_request(self, parents_query: str, *, per_page: int, page_token=None, query=None,
+                               exclude_shortcuts: bool = True, fields: str = FILE_LIST_FIELDS):
+        """Build the files.list request for one page of items under the given parents"""
+        query_internal = f"({parents_query}) and trashed=false{EXCLUDED_MIMES_QUERY}"
+        if exclude_shortcuts:
+            query_internal += SHORTCUTS_QUERY
+        if query:
+            query_internal += f" and {query}"
+
+        return self.get_file_service().list(
+            q=query_internal,
+            pageSize=per_page,
+            pageToken=page_token,
+            fields=f"nextPageToken,files({fields})"
+        )
+
+    def _list_children(self, parents_query: str, *, per_page: int, page_token=None, query=None,
+                       exclude_shortcuts: bool = True, fields: str = FILE_LIST_FIELDS) -> tuple:
+        """List one page of items whose parents match the given query clause"""
+        try:
+            results = self._list_children_request(
+                parents_query, per_page=per_page, page_token=page_token,
+                query=query, exclude_shortcuts=exclude_shortcuts, fields=fields
             ).execute()
 
             return results.get('files', []), results.get('nextPageToken')
@@ -242,64 +501,176 @@ The authorization code format is incorrect.
             st.error(f"Error fetching files: {e}")
             return [], None
 
-    async def get_files_recursive(self, parent_folder_id: str, *, visited_folders=None):
-        """Recursively get files from Google Drive folder and all subfolders"""
+    def _get_folder_tree(self) -> dict[str, list[dict]]:
+        """Map every parent folder ID to its direct subfolders using a single paged query"""
+        subfolders_by_parent: dict[str, list[dict]] = {}
+        folder_parents = {}
+        page_token = None
+        while True:
+            results = self.get_file_service().list(
+                q=f"mimeType='{FOLDER_MIME_TYPE}' and trashed=false",
+                pageSize=MAX_PAGE_SIZE,
+                pageToken=page_token,
+                fields="nextPageToken,files(id,name,mimeType,parents)"
+            ).execute()
+            for folder in results.get('files', []):
+                # Seed the name cache so file paths resolve without per-folder lookups
+                folder_parents[folder['id']] = (folder.get('name'), folder.get('parents', [None])[0])
+                for parent_id in folder.get('parents', []):
+                    subfolders_by_parent.setdefault(parent_id, []).append(folder)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        self.folder_name_and_parent.update(folder_parents)
+        self.drive_cache.cache_folder_parents(folder_parents)
+        return subfolders_by_parent
+
+    def _get_descendant_folder_ids(self, parent_folder_id: str) -> list[str]:
+        """Return the folder and all of its descendants, walking the folder tree locally"""
+        folder_tree = None
+        folder_ids = []
+        uncached_subfolders = {}
+        visited_folders = set()
+        pending = [parent_folder_id]
+        while pending:
+            folder_id = pending.pop()
+            # Prevent infinite loops
+            if folder_id in visited_folders:
+                continue
+            visited_folders.add(folder_id)
+            folder_ids.append(folder_id)
+
+            subfolders = self.drive_cache.get_cached_subfolders(folder_id)
+            if subfolders is None:
+                if folder_tree is None:
+                    logger.debug("No cached subfolders for %s, fetching folder tree from API", folder_id)
+                    folder_tree = self._get_folder_tree()
+                subfolders = folder_tree.get(folder_id, [])
+                uncached_subfolders[folder_id] = subfolders
+            pending.extend(subfolder['id'] for subfolder in subfolders)
+        # Persist everything learned from the folder tree with a single commit
+        if uncached_subfolders:
+            self.drive_cache.cache_subfolders_bulk(uncached_subfolders)
+        return folder_ids
+
+    async def _get_files_in_folders(self, folder_ids: list[str], *, exclude_shortcuts: bool = True) -> list[dict]:
+        """Get the direct files of many folders, querying several parents at once
+
+        Each query covers a chunk of parents and the chunk queries are sent
+        together as batch requests; chunks with more pages are re-queued with
+        their page token for the next round. When a round needs several batch
+        requests they run on a small thread pool.
+        """
+        chunks = [folder_ids[start:start + PARENTS_PER_QUERY] for start in range(0, len(folder_ids), PARENTS_PER_QUERY)]
+        parents_queries = [" or ".join(f"'{folder_id}' in parents" for folder_id in chunk) for chunk in chunks]
+        files_by_folder: dict[str, list[dict]] = {folder_id: [] for folder_id in folder_ids}
+        failed_chunks = {}
+        next_pages = []
+
+        # Callbacks may run on pool threads, so they only record results
+        def on_listed(request_id, response, exception):
+            chunk_index = int(request_id)
+            if exception is not None:
+                failed_chunks[chunk_index] = exception
+                return
+            chunk = chunks[chunk_index]
+            for file in response.get('files', []):
+                # File it under every listed parent so each folder's cached listing is complete
+                parent_ids = [p for p in file.get('parents', []) if p in chunk] or [chunk[0]]
+                for parent_id in parent_ids:
+                    files_by_folder[parent_id].append(file)
+            if response.get('nextPageToken'):
+                next_pages.append((chunk_index, response['nextPageToken']))
+
+        pending = [(chunk_index, None) for chunk_index in range(len(chunks))]
+        while pending:
+            batches = []
+            for start in range(0, len(pending), MAX_BATCH_REQUESTS):
+                batch = self.service.new_batch_http_request(callback=on_listed)
+                for chunk_index, page_token in pending[start:start + MAX_BATCH_REQUESTS]:
+                    batch.add(
+                        self._list_children_request(
+                            parents_queries[chunk_index], per_page=MAX_PAGE_SIZE, page_token=page_token,
+                            query=f"mimeType!='{FOLDER_MIME_TYPE}'", exclude_shortcuts=exclude_shortcuts
+                        ),
+                        request_id=str(chunk_index)
+                    )
+                batches.append(batch)
+            self._execute_batches(batches)
+            pending, next_pages = next_pages, []
+
+        for exception in failed_chunks.values():
+            st.error(f"Error fetching files: {exception}")
+
+        all_files = []
+        to_cache = {}
+        for chunk_index, chunk in enumerate(chunks):
+            for folder_id in chunk:
+                files = files_by_folder[folder_id]
+                # The file cache holds the default, shortcut-free listing of fully listed folders
+                if exclude_shortcuts and chunk_index not in failed_chunks:
+                    to_cache[folder_id] = files
+                    if len(to_cache) >= CACHE_WRITE_BATCH_SIZE:
+                        self.drive_cache.cache_files_bulk(to_cache, recursive=False)
+                        to_cache = {}
+                all_files.extend(files)
+        self.drive_cache.cache_files_bulk(to_cache, recursive=False)
+        return all_files
+
+    def _execute_batches(self, batches: list) -> None:
+        """Execute batch requests, running several at once when there is more than one"""
+        if len(batches) == 1:
+            batches[0].execute()
+            return
+        def execute(batch):
+            batch.execute(http=thread_authorized_http(self.credentials))
+
+        list(_LISTING_POOL.map(execute, batches))
+
+    async def iter_files_recursive(self, parent_folder_id: str, *, exclude_shortcuts: bool = True):
+        """Yield files from Google Drive folder and all subfolders, a batch at a time
+
+        The folder hierarchy is resolved from one drive-wide folder listing,
+        then files are listed for many folders per query instead of one
+        request per folder. Cached folders are yielded first; the rest are
+        listed in slabs so callers can process files while later ones load.
+        """
         logger.debug("Scanning folder_id: %s", parent_folder_id)
+        if parent_folder_id == 'root':
+            # Children of My Drive reference the real root ID in their parents
+            parent_folder_id = self.get_root_folder_id()
 
-        if visited_folders is None:
-            visited_folders = set()
+        # A file with several parents is listed under each scanned one; yield it only once,
+        # otherwise it would be grouped as a duplicate of itself
+        seen_file_ids = set()
 
-        # Prevent infinite loops
-        if parent_folder_id in visited_folders:
-            return []
+        def unseen(files):
+            new_files = [file for file in files if file['id'] not in seen_file_ids]
+            seen_file_ids.update(file['id'] for file in new_files)
+            return new_files
 
-        visited_folders.add(parent_folder_id)
-        all_files = []
-        all_subfolders = []
         try:
-            # Try to get subfolders from cache first
-            cached_subfolders = self.drive_cache.get_cached_subfolders(parent_folder_id)
-            cached_files = self.drive_cache.get_cached_files(parent_folder_id, recursive=False)
-
-            if cached_files is not None or cached_subfolders is not None: # use cache if available
-                logger.debug(f"Using cached files or subfolders for {parent_folder_id}")
-                if cached_files:
-                    all_files.extend(cached_files)
-                if cached_subfolders:
-                    all_subfolders.extend(cached_subfolders)
-            else: # use API if cache is not available
-                logger.debug(f"No cache found for {parent_folder_id}, fetching from API")
-
-                # Get both files and folders from API
-                page_token = None
-                while True:
-                    files_and_folders, page_token = await self.get_files_and_folders(parent_folder_id, page_token=page_token)
-                    logger.debug("files_and_folders: %s", files_and_folders)
-                    files = [f for f in files_and_folders if f.get('mimeType') != 'application/vnd.google-apps.folder']
-                    subfolders = [f for f in files_and_folders if f.get('mimeType') == 'application/vnd.google-apps.folder']
-                    all_files.extend(files)
-                    all_subfolders.extend(subfolders)
-
-                    logger.debug("Only files: %s", all_files)
-                    logger.debug("Subfolders: %s", all_subfolders)
-
-                    if not page_token:
-                        break
-
-                # Cache both subfolders and files for future use
-                self.drive_cache.cache_subfolders(parent_folder_id, all_subfolders)
-                self.drive_cache.cache_files(parent_folder_id, recursive=False, files=all_files)
-
-            # Get subfolders and recursively scan them
-            for subfolder in all_subfolders:
-                subfolder_files = await self.get_files_recursive(subfolder['id'], visited_folders=visited_folders.copy())
-                all_files.extend(subfolder_files)
+            uncached_folder_ids = []
+            for folder_id in self._get_descendant_folder_ids(parent_folder_id):
+                cached_files = None
+                if exclude_shortcuts:
+                    cached_files = self.drive_cache.get_cached_files(folder_id, recursive=False)
+                if cached_files is None:
+                    uncached_folder_ids.append(folder_id)
+                elif cached_files := unseen(cached_files):
+                    yield cached_files
+
+            logger.debug("Fetching files for %d uncached folders from API", len(uncached_folder_ids))
+            for start in range(0, len(uncached_folder_ids), FOLDERS_PER_SLAB):
+                files = unseen(await self._get_files_in_folders(
+                    uncached_folder_ids[start:start + FOLDERS_PER_SLAB], exclude_shortcuts=exclude_shortcuts
+                ))
+                if files:
+                    yield files
 
         except Exception as e:
             st.warning(f"Error scanning folder {parent_folder_id}: {e}")
 
-        return all_files
-
     def get_file_info(self, file:dict) -> dict:
         file_id = file['id']
         return self.get_file_detail(file_id)
@@ -312,12 +683,13 @@ The authorization code format is incorrect.
 
         try:
             # Try to get from cache first
-            cached_info = self.drive_cache.get_cached_file_details(file_id)
+            # Stale details are still shown while a background refresh replaces them
+            cached_info = self.drive_cache.get_cached_file_details(file_id, on_stale=self._refresh_file_detail)
             if cached_info:
                 file = get_enriched_file_info(cached_info)
             else:
                 # Not in cache, fetch from API
-                file = self.service.files().get(fileId=file_id, fields='*').execute()
+                file = self.service.files().get(fileId=file_id, fields=FILE_DETAIL_FIELDS).execute()
                 # Cache the result
                 self.drive_cache.cache_file_details(file)
             return get_enriched_file_info(file)
@@ -325,6 +697,27 @@ The authorization code format is incorrect.
             logger.error("Failed to retrieve file info: %s", e)
             return {}
 
+    def _refresh_file_detail(self, file_id: str) -> None:
+        """Queue a background re-fetch of a file's details unless one is already pending"""
+        # Claim the file ID atomically so concurrent reruns start a single refresh
+        with _detail_refreshes_lock:
+            if file_id in _detail_refreshes:
+                return
+            _detail_refreshes.add(file_id)
+        _DETAIL_REFRESH_POOL.submit(self._fetch_file_detail, file_id)
+
+    def _fetch_file_detail(self, file_id: str) -> None:
+        try:
+            file = self.service.files().get(fileId=file_id, fields=FILE_DETAIL_FIELDS).execute(
+                http=thread_authorized_http(self.credentials)
+            )
+            self.drive_cache.cache_file_details(file)
+        except Exception as e:
+            logger.debug("Background refresh of file %s failed: %s", file_id, e)
+        finally:
+            with _detail_refreshes_lock:
+                _detail_refreshes.discard(file_id)
+
     def get_folder_info(self, folder_id: str) -> dict:
         return self.get_folder_detail(folder_id)
 
@@ -333,36 +726,32 @@ The authorization code format is incorrect.
 
     def get_folder_id_from_path(self, folder_path: str):
         folder_path = folder_path.strip().strip('/')
-
-        try:
-            return self.folder_path_to_id[folder_path]
-        except KeyError:
-            pass
+        folder_id = self.folder_path_to_id.get(folder_path)
+        if folder_id is not None:
+            return folder_id
 
         parent_id = 'root'  # Start from "My Drive"
         if folder_path in ('My Drive', 'root'):
             self.folder_path_to_id[folder_path] = parent_id
             return parent_id
 
-        if folder_path.startswith('My Drive'):
+        if folder_path.startswith('My Drive/'):
             folder_path = folder_path[9:] # Delete "My Drive/" prefix
-        parts = folder_path.split('/')
-
-        current_path = parts[0] if parts else 'My Drive'
-        self.folder_path_to_id[current_path] = parent_id
-        for part in parts:
-            query = f"'{parent_id}' in parents and name = '{part}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
-            results = self.get_file_service().list(q=query, spaces='drive', fields="files(id, name)").execute()
-            items = results.get('files', [])
-            if not items:
-                raise FileNotFoundError(f"Folder '{part}' not found in path.")
-
-            parent_id = items[0]['id']  # Go one level deeper
 
-            # Build up the current path as we go
-            current_path = f"{current_path}/{part}"
-
-            self.folder_path_to_id[current_path] = parent_id
+        # Walk down from the root, skipping the API for any leading folders already resolved
+        current_path = ''
+        for part in folder_path.split('/'):
+            current_path = f"{current_path}/{part}" if current_path else part
+            folder_id = self.folder_path_to_id.get(current_path)
+            if folder_id is None:
+                query = f"'{parent_id}' in parents and name = '{part}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+                results = self.get_file_service().list(q=query, spaces='drive', fields="files(id, name)").execute()
+                items = results.get('files', [])
+                if not items:
+                    raise FileNotFoundError(f"Folder '{part}' not found in path.")
+                folder_id = items[0]['id']
+                self.folder_path_to_id[current_path] = folder_id
+            parent_id = folder_id  # Go one level deeper
 
         return parent_id
 
@@ -370,7 +759,6 @@ The authorization code format is incorrect.
         if self.root_folder_id:
             return self.root_folder_id
 
-        import time
         time.sleep(1)  # Give some time for the service to initialize
         file = self.get_file_service().get(fileId='root', fields='id').execute()
         logger.debug("Root folder ID from API: %s", file)
@@ -386,15 +774,24 @@ The authorization code format is incorrect.
         if self.is_root_folder_id(folder_id):
             return 'My Drive', None
 
-        file = self.get_folder_info(folder_id)
-        return file.get('name'), file.get('parents', [None])[0]
+        name_and_parent = self.folder_name_and_parent.get(folder_id)
+        if name_and_parent is not None:
+            return name_and_parent
+
+        # Folders seen by an earlier run resolve from the cache database without an API call
+        name_and_parent = self.drive_cache.get_cached_folder_parent(folder_id)
+        if name_and_parent is None:
+            file = self.get_folder_info(folder_id)
+            name_and_parent = (file.get('name'), file.get('parents', [None])[0])
+            self.drive_cache.cache_folder_parents({folder_id: name_and_parent})
+        self.folder_name_and_parent[folder_id] = name_and_parent
+        return name_and_parent
 
     def get_folder_path_from_id(self, folder_id):
         """Get folder path from Google Drive folder ID"""
-        try:
-            return self.folder_id_to_path[folder_id]
-        except KeyError:
-            pass
+        folder_path = self.folder_id_to_path.get(folder_id)
+        if folder_path is not None:
+            return folder_path
 
         if self.is_root_folder_id(folder_id):
             self.folder_id_to_path[folder_id] = 'My Drive' # for future hits
@@ -405,6 +802,62 @@ The authorization code format is incorrect.
         self.folder_id_to_path[folder_id] = full_path # for future hits
         return full_path
 
+    def get_folder_paths_from_ids(self, folder_ids: list[str]) -> dict[str, str]:
+        """Get paths for many folders, fetching unknown ancestors together instead of one by one"""
+        self._resolve_folder_ancestors(folder_ids)
+        return {folder_id: self.get_folder_path_from_id(folder_id) for folder_id in folder_ids}
+
+    def _resolve_folder_ancestors(self, folder_ids: list[str]) -> None:
+        """Load the name and parent of every ancestor of the given folders
+
+        Ancestors missing from the memory and database caches are fetched with
+        batch requests, one round per tree level that is still unknown.
+        """
+        failed = set()
+        while True:
+            unknown = set()
+            for folder_id in folder_ids:
+                current_id = folder_id
+                while (current_id and current_id not in self.folder_id_to_path and current_id not in failed
+                       and current_id not in ('root', self.root_folder_id)):
+                    name_and_parent = self.folder_name_and_parent.get(current_id)
+                    if name_and_parent is None:
+                        name_and_parent = self.drive_cache.get_cached_folder_parent(current_id)
+                        if name_and_parent is None:
+                            unknown.add(current_id)
+                            break
+                        self.folder_name_and_parent[current_id] = name_and_parent
+                    current_id = name_and_parent[1]
+            if not unknown:
+                return
+
+            fetched = {}
+
+            # Callbacks may run on pool threads, so they only record results
+            def on_folder(request_id, response, exception):
+                if exception is not None:
+                    # Left to the single lookup in get_folder_path_from_id
+                    failed.add(request_id)
+                    return
+                fetched[request_id] = (response.get('name'), response.get('parents', [None])[0])
+
+            unknown_ids = list(unknown)
+            batches = []
+            for start in range(0, len(unknown_ids), MAX_BATCH_REQUESTS):
+                batch = self.service.new_batch_http_request(callback=on_folder)
+                for folder_id in unknown_ids[start:start + MAX_BATCH_REQUESTS]:
+                    batch.add(self.get_file_service().get(fileId=folder_id, fields='id,name,parents'),
+                              request_id=folder_id)
+                batches.append(batch)
+            try:
+                self._execute_batches(batches)
+            except Exception as e:
+                # Whatever is still unknown resolves one folder at a time in get_folder_path_from_id
+                logger.warning("Batch lookup of %d folders failed: %s", len(unknown_ids), e)
+                failed.update(set(unknown_ids) - fetched.keys())
+            self.folder_name_and_parent.update(fetched)
+            self.drive_cache.cache_folder_parents(fetched)
+
     def get_file_media(self, file_id: str, is_thumbnail: bool = False) -> Union[bytes, None]:
         """
         Get media content for a file, either from cache or by downloading.
@@ -419,6 +872,14 @@ The authorization code format is incorrect.
         cache_id = f"{file_id}_thumb" if is_thumbnail else file_id
         logger.debug("Cache hit for media %s", file_id)
 
+        # Let a running prefetch finish instead of downloading the same file twice
+        prefetch = _media_prefetches.get(cache_id)
+        if prefetch is not None:
+            try:
+                prefetch.result(timeout=MEDIA_PREFETCH_WAIT_SECONDS)
+            except Exception as e:
+                logger.debug("Prefetch of media %s did not complete: %s", file_id, e)
+
         # First check the cache
         media_content = self.drive_cache.get_cached_media(cache_id)
 
@@ -431,15 +892,11 @@ The authorization code format is incorrect.
             logger.debug("Not found in cache, fetching from Google Drive")
             media_type: Union[str, None] = None
             if is_thumbnail:
-                # Try to get thumbnail from Google Drive's thumbnail API
-                thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w250"
-                response = requests.head(thumbnail_url, timeout=10)
-
-                if response.status_code == 200:
-                    media_content = response.content
-                    return media_content
-            # Get full media content
-            media_content = self.service.files().get_media(fileId=file_id).execute()
+                media_content, media_type = self._download_thumbnail(file_id)
+                if media_content is None:
+                    return None
+            else:
+                media_content = self._download_media(file_id)
 
             # Cache the media content
             self.drive_cache.cache_media(
@@ -454,12 +911,74 @@ The authorization code format is incorrect.
             logger.error(f"Failed to get {'thumbnail' if is_thumbnail else 'media'} for file {file_id}: {e}")
             return None
 
+    def _download_thumbnail(self, file_id: str) -> tuple[Union[bytes, None], Union[str, None]]:
+        """Fetch the thumbnail Drive generated for a file, or (None, None) when it has no usable one"""
+        # thumbnailLink is short-lived, so it is looked up fresh rather than taken from cached details
+        file = self.service.files().get(fileId=file_id, fields='thumbnailLink').execute()
+        thumbnail_link = file.get('thumbnailLink')
+        if not thumbnail_link:
+            return None, None
+
+        response, content = thread_authorized_http(self.credentials).request(thumbnail_link)
+        media_type = response.get('content-type', '')
+        # Anything but an image (a sign-in or error page) must not be cached as the thumbnail
+        if response.status != 200 or not media_type.startswith('image/') or not content:
+            logger.debug("No usable thumbnail for %s (status %s, %s)", file_id, response.status, media_type)
+            return None, None
+        return content, media_type
+
+    def _download_media(self, file_id: str, http=None) -> bytes:
+        """Stream a file's full media content into one buffer"""
+        request = self.service.files().get_media(fileId=file_id)
+        if http is not None:
+            request.http = http
+        buffer = io.BytesIO()
+        downloader = MediaIoBaseDownload(buffer, request, chunksize=MEDIA_DOWNLOAD_CHUNK_SIZE)
+        done = False
+        while not done:
+            _, done = downloader.next_chunk()
+        return buffer.getvalue()
+
+    def prefetch_media(self, file_ids: list[str]) -> None:
+        """Start downloading uncached media in the background so previews find it in the cache"""
+        cached_ids = self.drive_cache.cached_media_ids(file_ids)
+        for file_id in file_ids:
+            if file_id in _media_prefetches or file_id in cached_ids:
+                continue
+            future = _MEDIA_PREFETCH_POOL.submit(self._prefetch_one, file_id)
+            _media_prefetches[file_id] = future
+            future.add_done_callback(lambda _, key=file_id: _media_prefetches.pop(key, None))
+
+    def _prefetch_one(self, file_id: str) -> None:
+        # httplib2 connections are not thread-safe, so each worker thread downloads over its own
+        media_content = self._download_media(file_id, http=thread_authorized_http(self.credentials))
+        self.drive_cache.cache_media(file_id=file_id, media_type=None, media_content=media_content)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an API error is a Drive rate limit that is worth retrying"""
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    content = error.content or b''
+    return error.resp.status == 403 and (b'rateLimitExceeded' in content or b'userRateLimitExceeded' in content)
+
 
 def extract_file_id_and_name(file: dict) -> tuple[str, str]:
     """Extract file ID and name from Google Drive file dictionary"""
     return str(file.get('id')), str(file.get('name', 'Unknown'))
 
 
+def get_web_view_link(file: dict) -> str:
+    """Return the Drive web link, deriving it from the file ID when it was not requested"""
+    web_link = file.get('webViewLink')
+    if web_link:
+        return web_link
+    file_id = file.get('id')
+    return f"https://drive.google.com/file/d/{file_id}/view" if file_id else ''
+
+
 def extract_time_info(file_info: dict) -> tuple[str, str]:
     """Extract and format creation and modification times from file info"""
     logger.debug("Extracting time info from file:")
@@ -473,25 +992,76 @@ def extract_time_info(file_info: dict) -> tuple[str, str]:
     return created_formatted, modified_formatted
 
 
-def get_enriched_file_info(file: dict) -> dict:
-    """Create a standardized file info dictionary from Google Drive file info"""
-    # Extract timestamps
-    created_formatted, modified_formatted = extract_time_info(file)
+@dataclass(slots=True, frozen=True)
+class DriveFileView:
+    """Display fields of a Drive file, derived once from its listing metadata"""
+    file_id: str
+    name: str
+    size: int
+    size_formatted: str
+    ext: str
+    path: str
+    mime: str
+    created: str
+    modified: str
+    web_link: str
+    links: tuple[tuple[str, str], ...]
+
+
+def _file_links(file_id: str, mime_type: str, web_link: str) -> tuple[tuple[str, str], ...]:
+    """Build the (text, url) action links shown for a Drive file"""
+    links = []
+    if web_link:
+        links.append(('🔗 Open in Google Drive', web_link))
+
+    # Additional viewing options for images
+    if file_id and mime_type.startswith('image/'):
+        links.append(('📥 Download Image', f"https://drive.google.com/uc?id={file_id}&export=download"))
+        links.append(('👁️ Preview in New Tab', f"https://drive.google.com/file/d/{file_id}/view"))
+    return tuple(links)
+
+
+def get_file_view(file: dict) -> DriveFileView:
+    """Return the display record for a listing dict, building and attaching it on first use"""
+    view = file.get('_view')
+    if view is None:
+        created_formatted, modified_formatted = extract_time_info(file)
+        size_bytes = int(file.get('size') or 0)
+        file_id = file.get('id', '')
+        mime_type = file.get('mimeType', '')
+        web_link = get_web_view_link(file)
+        view = file['_view'] = DriveFileView(
+            file_id=file_id,
+            name=file.get('name', 'Unknown'),
+            size=size_bytes,
+            size_formatted=human_readable_size(size_bytes),
+            ext=get_file_extension(file.get('name', '')),
+            path=web_link or file_id,
+            mime=mime_type,
+            created=created_formatted,
+            modified=modified_formatted,
+            web_link=web_link,
+            links=_file_links(file_id, mime_type, web_link),
+        )
+    return view
 
-    # Get file size
-    size_bytes = int(file.get('size', 0))
 
+def get_enriched_file_info(file: dict) -> dict:
+    """Create a standardized file info dictionary from Google Drive file info"""
+    view = get_file_view(file)
     enriched_info = {
-        'name': file.get('name', 'Unknown'),
-        'size': size_bytes,
-        'size_formatted': human_readable_size(size_bytes),
-        'extension': get_file_extension(file.get('name', '')),
-        'path': file.get('webViewLink', file.get('id', '')),
-        'mime_type': file.get('mimeType', ''),
-        'created': created_formatted,
-        'modified': modified_formatted,
+        'name': view.name,
+        'size': view.size,
+        'size_formatted': view.size_formatted,
+        'extension': view.ext,
+        'path': view.path,
+        'mime_type': view.mime,
+        'created': view.created,
+        'modified': view.modified,
         'source': 'Google Drive'
     }
     enriched_info.update(file)
+    # The view stays attached to the listing dict only; copies get their own on demand
+    enriched_info.pop('_view', None)
 
     return enriched_info
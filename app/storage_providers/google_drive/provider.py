@@ -1,21 +1,41 @@
 """Google Drive storage provider implementation."""
 
-import os
+import asyncio
 import logging
 import time
-from typing import Dict, List
+from dataclasses import astuple
+from itertools import islice
+from typing import Dict, List, Union
 
-import requests
 import streamlit as st
 
-from .google_utils import extract_file_id_and_name, get_enriched_file_info, CREDENTIALS_FILE
+from .google_utils import (
+    auth_files_present, extract_file_id_and_name, get_enriched_file_info, get_file_view,
+    is_rate_limit_error, MAX_PAGE_SIZE
+)
 from ..base import BaseStorageProvider, ScanFilterOptions
 from ..exceptions import NoDuplicateException, NoFileFoundException
+from ...preview import preview_blob_inline
 from ...utils import get_thumbnail_from_image_data
 from .authenticator import GoogleAuthenticator
 
 logger = logging.getLogger(__name__)
 
+SCAN_CACHE_KEY = 'gdrive_scan_cache'
+SCAN_CACHE_TTL_SECONDS = 600
+DELETE_BATCH_SIZE = 100  # Drive accepts at most 100 calls per batch request
+MAX_DELETE_RETRIES = 5
+STATUS_UPDATE_INTERVAL = 0.2  # Seconds between scan status redraws
+FOLDER_PICKER_LIMIT = 200  # Keeps the folder selectbox a manageable size
+THUMBNAIL_CACHE_ENTRIES = 512
+MAX_REPORTED_SCAN_ERRORS = 20
+
+
+@st.cache_data(show_spinner=False, max_entries=THUMBNAIL_CACHE_ENTRIES)
+def _drive_thumbnail(file_id: str, version: str, _google_service) -> bytes:
+    """Square thumbnail of a Drive image, cached per file version across reruns"""
+    return get_thumbnail_from_image_data(_google_service.get_file_media(file_id=file_id))
+
 
 def log_scan_summary(*,total_files, processed_files, skipped_no_hash, skipped_filters, duplicates, file_dict):
     """Log and display scan summary"""
@@ -25,8 +45,9 @@ def log_scan_summary(*,total_files, processed_files, skipped_no_hash, skipped_fi
     logger.info("- Files skipped (no MD5): %d", skipped_no_hash)
     logger.info("- Files skipped (filters): %d", skipped_filters)
     logger.info("- Duplicate groups found: %d", len(duplicates))
-    if processed_files > 0:
-        logger.info("**All processed files with hashes:**")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if processed_files > 0 and debug_enabled:
+        logger.debug("**All processed files with hashes:**")
         for hash_key, files in file_dict.items():
             hash_display = hash_key[:16] + "..." if len(hash_key) > 16 else hash_key
             logger.debug("**Hash %s:** %d file(s)", hash_display, len(files))
@@ -34,17 +55,19 @@ def log_scan_summary(*,total_files, processed_files, skipped_no_hash, skipped_fi
                 md5_display = file['md5_hash'][:8] + "..." if file['md5_hash'] != 'fallback' and len(file['md5_hash']) > 8 else file['md5_hash']
                 logger.debug("  - %s (%s bytes, MD5: %s)", file['name'], file['size'], md5_display)
     if duplicates:
-        for i, (hash_key, files) in enumerate(list(duplicates.items())[:3]):
-            logger.info("**Group %d:** %d files", i+1, len(files))
-            for file in files:
-                hash_type = "MD5" if file.get('has_md5') else "Name+Size"
-                logger.debug("  - %s (%s)", file['name'], hash_type)
+        first_groups = list(islice(duplicates.items(), 3))
+        logger.info("\n".join(f"**Group {i + 1}:** {len(files)} files" for i, (_, files) in enumerate(first_groups)))
+        if debug_enabled:
+            for _, files in first_groups:
+                for file in files:
+                    hash_type = "MD5" if file.get('has_md5') else "Name+Size"
+                    logger.debug("  - %s (%s)", file['name'], hash_type)
 
         if len(duplicates) > 3:
             logger.info("... and %d more groups", len(duplicates) - 3)
 
         # # Show some details about the duplicates found
-        # for i, (hash_key, files) in enumerate(list(duplicates.items())[:3]):  # Show first 3 groups
+        # for i, (hash_key, files) in enumerate(islice(duplicates.items(), 3)):  # Show first 3 groups
         #     logger.info("**Group %d:** %d files", i+1, len(files))
         #     for file in files:
         #         hash_type = "MD5" if file.get('has_md5') else "Name+Size"
@@ -68,7 +91,8 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
 
     def _check_dependencies(self):
         """Check for required Google Drive dependencies and credentials file."""
-        if not os.path.exists(CREDENTIALS_FILE):
+        credentials_present, _ = auth_files_present()
+        if not credentials_present:
             st.error("📋 **Setup Required**")
             st.markdown("""
             **To enable Google Drive integration:**
@@ -105,8 +129,15 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             else:
                 folder_id = self.google_service.get_folder_id_from_path(selected_folder)
             logger.debug("Selected folder ID: %s", folder_id)
+            reuse_recent_scan = st.checkbox(
+                "Reuse recent scan results",
+                value=False,
+                help=f"Skip rescanning if this folder was scanned with the same options "
+                     f"in the last {SCAN_CACHE_TTL_SECONDS // 60} minutes",
+            )
             return {
                 'folder_id': folder_id,
+                'reuse_recent_scan': reuse_recent_scan,
             }
 
         st.info("No accessible folders found in Google Drive")
@@ -129,8 +160,7 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
         else:
             st.success("✅ Connected to Google Drive")
         try:
-            import asyncio
-            folders, _ = asyncio.run(self.google_service.get_folders(parent_folder_id='root', per_page=50))
+            folders = self.google_service.get_folders_cached('root', per_page=FOLDER_PICKER_LIMIT)
             folders = [{"name": f"My Drive/{folder['name']}", "id": folder['id']} for folder in folders]
             return self._handle_folder_selection(folders)
         except Exception as e:
@@ -138,93 +168,145 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             logger.exception(e)
             return None
 
-    async def _collect_files(self, folder_id, recursive, status_el):
-        """Collect all files from the specified folder (recursively if needed)"""
-        all_files = []
-        if recursive:
+    async def _iter_file_pages(self, folder_id, filters: ScanFilterOptions, status_el):
+        """Yield files from the specified folder (recursively if needed) page by page"""
+        if filters.include_subfolders:
             status_el.text("Discovering folders and files recursively...")
-            all_files = await self.google_service.get_files_recursive(
+            async for files in self.google_service.iter_files_recursive(
+                parent_folder_id=folder_id,
+                exclude_shortcuts=filters.exclude_shortcuts,
+            ):
+                yield files
+            return
+
+        status_el.text("Fetching file list from Google Drive...")
+        page_token = None
+        while True:
+            files, page_token = await self.google_service.get_files(
                 parent_folder_id=folder_id,
+                per_page=MAX_PAGE_SIZE,
+                page_token=page_token,
+                exclude_shortcuts=filters.exclude_shortcuts,
             )
+            yield files
+            if not page_token:
+                break
+
+    def _build_file_filter(self, filters: ScanFilterOptions):
+        """Build a check returning a file's skip reason (None to keep it) and its size
+
+        Filter settings are resolved once per scan so the per-file check only
+        compares integers. The name check runs before the size is parsed.
+        """
+        exclude_hidden = filters.exclude_hidden
+        # Drive's files.list query language has no size term, so size bounds
+        # cannot be pushed into the listing query and are checked here
+        min_size_bytes = filters.min_size_kb * 1024
+        max_size_bytes = filters.max_size_kb * 1024 if filters.max_size_kb > 0 else None
+
+        def check_file(file_name, file_info):
+            if exclude_hidden and file_name.startswith('.'):
+                return "hidden file", 0
+            file_size_bytes = int(file_info.get('size', 0))
+            if file_size_bytes < min_size_bytes:
+                return "too small", file_size_bytes
+            if max_size_bytes is not None and file_size_bytes > max_size_bytes:
+                return "too large", file_size_bytes
+            return None, file_size_bytes
+
+        return check_file
+
+    def group_by_hash(self, file_info, file_name, file_size_bytes, first_by_hash, duplicates, skipped_no_hash):
+        """Process a single file: calculate hash, group, and update counters
+
+        Most hashes are unique, so a file is only remembered in first_by_hash until
+        a second file with the same hash shows up; a group list is created then.
+        Files without an MD5 are keyed by a (name, size) tuple, and the hash
+        annotations are only added to files that end up in a group.
+        """
+        md5_checksum = file_info.get('md5Checksum')
+        if md5_checksum:
+            group_key = md5_checksum
         else:
-            status_el.text("Fetching file list from Google Drive...")
-            page_token = None
-            while True:
-                files, page_token = await self.google_service.get_files(
-                    parent_folder_id=folder_id,
-                    page_token=page_token,
-                )
-                all_files.extend(files)
-                if not page_token:
-                    break
-        return all_files
-
-    def _apply_file_filters(self, file_info, filters: ScanFilterOptions):
-        """Apply filters to a file and return skip reason if any, else None"""
-        file_name = file_info.get('name', '')
-        file_size_bytes = int(file_info.get('size', 0))
-        file_size_kb = file_size_bytes / 1024
-        if filters.exclude_hidden and file_name.startswith('.'):
-            return "hidden file"
-        if file_size_kb < filters.min_size_kb:
-            return f"too small ({file_size_kb:.1f} KB < {filters.min_size_kb} KB)"
-        if filters.max_size_kb > 0 and file_size_kb > filters.max_size_kb:
-            return f"too large ({file_size_kb:.1f} KB > {filters.max_size_kb} KB)"
-        return None
-
-    def group_by_hash(self, file_info, file_dict, skipped_no_hash):
-        """Process a single file: calculate hash, group, and update counters"""
-        file_name = file_info.get('name', '')
-        file_size_bytes = int(file_info.get('size', 0))
-        file_hash = file_info.get('md5Checksum')
-        if not file_hash:
-            file_hash = f"fallback_{file_name}_{file_size_bytes}"
+            group_key = (file_name, file_size_bytes)
             skipped_no_hash += 1
 
-        if file_hash not in file_dict:
-            file_dict[file_hash] = []
-        file_data ={
-            'url': file_info.get('webViewLink', ''),
-            'has_md5': bool(file_info.get('md5Checksum')),
-            'md5_hash': file_info.get('md5Checksum', file_hash)
-        }
-        file_data.update(file_info)
-        file_dict[file_hash].append(file_data)
+        group = duplicates.get(group_key)
+        if group is not None:
+            group.append(self._annotate_hash(file_info, group_key))
+        elif group_key in first_by_hash:
+            duplicates[group_key] = [
+                self._annotate_hash(first_by_hash.pop(group_key), group_key),
+                self._annotate_hash(file_info, group_key),
+            ]
+        else:
+            first_by_hash[group_key] = file_info
 
         return skipped_no_hash
 
-    def find_duplicates(self, all_files: list[dict], filters: ScanFilterOptions, progress_bar) -> Dict:
-        file_dict: dict[str, list[dict]] = {}
+    @staticmethod
+    def _annotate_hash(file_info, group_key):
+        """Record the grouping hash and display record on the listing dict in place rather than copying it"""
+        get_file_view(file_info)
+        if isinstance(group_key, tuple):
+            file_name, file_size_bytes = group_key
+            file_info['has_md5'] = False
+            file_info['md5_hash'] = f"fallback_{file_name}_{file_size_bytes}"
+        else:
+            file_info['has_md5'] = True
+            file_info['md5_hash'] = group_key
+        return file_info
+
+    async def find_duplicates(self, folder_id, filters: ScanFilterOptions, status_el) -> tuple[int, Dict]:
+        """Group files by hash as pages arrive; return the file count and duplicate groups"""
+        first_by_hash: dict[Union[str, tuple], dict] = {}
+        duplicates: dict[Union[str, tuple], list[dict]] = {}
         skipped_no_hash = 0
         skipped_filters = 0
-        total_files = len(all_files)
-
-        for i, file_info in enumerate(all_files):
-            try:
-                # Update progress
-                if i%5 == 0:  # Update progress at every 5 files
-                    progress = (i + 1) / total_files
-                    progress_bar.progress(progress)
-
-                # Apply filters
-                skip_reason = self._apply_file_filters(
-                    file_info,
-                    filters
-                )
-                if skip_reason:
-                    skipped_filters += 1
+        total_files = 0
+        last_status_update = 0.0
+        error_messages: list[str] = []
+        error_count = 0
+        check_file = self._build_file_filter(filters)
+
+        async for files in self._iter_file_pages(folder_id, filters, status_el):
+            for file_info in files:
+                try:
+                    # Read the fields shared by the filter and the grouping once
+                    file_name = file_info.get('name', '')
+
+                    # Apply filters
+                    skip_reason, file_size_bytes = check_file(file_name, file_info)
+                    if skip_reason:
+                        skipped_filters += 1
+                        continue
+
+                    skipped_no_hash = self.group_by_hash(
+                        file_info, file_name, file_size_bytes, first_by_hash, duplicates, skipped_no_hash
+                    )
+
+                except Exception as e:
+                    # Skip files that cause errors; they are reported together after the scan
+                    error_count += 1
+                    if len(error_messages) < MAX_REPORTED_SCAN_ERRORS:
+                        error_messages.append(f"{file_info.get('name', 'unknown')}: {e}")
                     continue
 
-                skipped_no_hash = self.group_by_hash(file_info, file_dict, skipped_no_hash)
+            # Update progress at most every STATUS_UPDATE_INTERVAL seconds
+            total_files += len(files)
+            now = time.monotonic()
+            if now - last_status_update >= STATUS_UPDATE_INTERVAL:
+                status_el.text(f"Analyzed {total_files} files...")
+                last_status_update = now
 
-            except Exception as e:
-                # Skip files that cause errors
-                st.write(f"Error processing {file_info.get('name', 'unknown')}: {e}")
-                continue
+        if error_count:
+            with st.expander(f"⚠️ {error_count} files could not be processed"):
+                st.text("\n".join(error_messages))
+                if error_count > len(error_messages):
+                    st.caption(f"...and {error_count - len(error_messages)} more")
 
-        # Filter to only return groups with duplicates
-        duplicates = {k: v for k, v in file_dict.items() if len(v) > 1}
-        return duplicates
+        # Key groups by the annotated hash, which spells out name+size fallback keys
+        return total_files, {group[0]['md5_hash']: group for group in duplicates.values()}
 
     def scan_directory(self, directory: dict, filters: ScanFilterOptions) -> Dict[str, List[dict]]:
         """Scan Google Drive directory for duplicates"""
@@ -234,7 +316,6 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             return {}
 
         # Handle both old string format and new dict format
-        recursive = filters.include_subfolders
         if isinstance(directory, dict):
             folder_id = directory.get('folder_id', 'root')
             # recursive = directory.get('recursive', False)
@@ -242,39 +323,45 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             folder_id = directory
             # recursive = False
 
+        # Pressing Scan rescans Drive unless the user opted into reusing an identical recent scan
+        scan_key = (folder_id, astuple(filters))
+        reuse_recent_scan = isinstance(directory, dict) and directory.get('reuse_recent_scan', False)
+        cached_scan = st.session_state.get(SCAN_CACHE_KEY)
+        if (reuse_recent_scan and cached_scan and cached_scan['key'] == scan_key
+                and time.time() - cached_scan['timestamp'] < SCAN_CACHE_TTL_SECONDS):
+            logger.debug("Reusing cached scan results for folder %s", folder_id)
+            return cached_scan['duplicates']
+
         # Create a placeholder for status messages that will be reused
         status_placeholder = st.empty()
-        progress_bar = st.progress(0)
         status_el = st.empty()
 
         # Initial status message
         status_placeholder.info("🔍 Scanning Google Drive for duplicates...")
 
         try:
-            # Get all files from the specified folder and subfolders
-            import asyncio
+            # Stream files from the specified folder and subfolders into hash groups
             start_time = time.time()
-            all_files = asyncio.run(self._collect_files(folder_id, recursive, status_el))
-            total_files = len(all_files)
+            total_files, duplicates = asyncio.run(
+                self.find_duplicates(folder_id, filters, status_el)
+            )
             elapsed_time = time.time() - start_time
-            logger.debug("Collected %d files in %.2f seconds", total_files, elapsed_time)
+            logger.debug("Scanned %d files in %.2f seconds", total_files, elapsed_time)
 
             if total_files == 0:
                 raise NoFileFoundException("No files found in the selected folder")
 
-            status_el.empty()  # Clear the initial status message
-
-            # Show processing status
-            status_placeholder.info(f"Found {total_files} files. Analyzing for duplicates...")
-
-            duplicates = self.find_duplicates(all_files, filters, progress_bar)
-
             # # Show scan summary
             # log_scan_summary(total_files, processed_files, skipped_no_hash, skipped_filters, duplicates, file_dict)
 
             if not duplicates:
                 raise NoDuplicateException("No duplicate files found in the selected folder.")
 
+            st.session_state[SCAN_CACHE_KEY] = {
+                'key': scan_key,
+                'timestamp': time.time(),
+                'duplicates': duplicates,
+            }
             return duplicates
         except (NoDuplicateException, NoFileFoundException) as e:
             raise e # forward the exception
@@ -285,7 +372,6 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
         finally:
             status_placeholder.empty()
             status_el.empty()
-            progress_bar.empty()
 
     def delete_files(self, files: List[dict]) -> bool:
         """Delete files from Google Drive"""
@@ -293,15 +379,29 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             st.error("Not authenticated with Google Drive")
             return False
 
+        # Scan results no longer reflect Drive once files are trashed
+        self._clear_scan_cache()
+
         try:
             success_count = 0
             total_count = len(files)
+            failed_names: List[str] = []
 
+            file_names = {}
             for file_path in files:
                 file_id, file_name = extract_file_id_and_name(file_path)
-                if file_id and self._delete_single_file(file_id, file_name):
-                    success_count += 1
+                if file_id:
+                    file_names[file_id] = file_name
+
+            file_ids = list(file_names)
+            for start in range(0, len(file_ids), DELETE_BATCH_SIZE):
+                chunk = file_ids[start:start + DELETE_BATCH_SIZE]
+                success_count += self._trash_batch(
+                    {file_id: file_names[file_id] for file_id in chunk}, failed_names
+                )
 
+            if failed_names:
+                st.error(f"❌ Failed to delete {len(failed_names)} files: " + ", ".join(f"'{name}'" for name in failed_names))
             return self._process_deletion_results(success_count, total_count)
 
         except Exception as e:
@@ -309,20 +409,55 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             logger.exception(e)
             return False
 
-    def _delete_single_file(self, file_id: str, file_name: str) -> bool:
-        """Delete/Trash a single file from Google Drive"""
-        try:
-            # Move the file to trash instead of permanent deletion
-            self.google_service.get_file_service().update(
-                fileId=file_id,
-                body={'trashed': True}
-            ).execute()
-            st.success(f"✅ Moved '{file_name}' to trash")
-            return True
-        except Exception as e:
-            st.error(f"❌ Failed to delete '{file_name}'")
-            logger.exception(e)
-            return False
+    def _clear_scan_cache(self):
+        """Forget cached scan results so the next scan reads Drive again"""
+        st.session_state.pop(SCAN_CACHE_KEY, None)
+
+    def _trash_batch(self, file_names: Dict[str, str], failed_names: List[str]) -> int:
+        """Move files to trash with one batched HTTP request, retrying rate-limited ones
+
+        Args:
+            file_names: Mapping of file ID to file name, at most DELETE_BATCH_SIZE entries
+            failed_names: Receives the names of files that could not be trashed
+
+        Returns:
+            Number of files moved to trash
+        """
+        success_count = 0
+        pending = dict(file_names)
+        rate_limited: Dict[str, str] = {}
+
+        def on_trashed(request_id, _response, exception):
+            nonlocal success_count
+            file_name = pending[request_id]
+            if exception is None:
+                success_count += 1
+            elif is_rate_limit_error(exception):
+                rate_limited[request_id] = file_name
+            else:
+                failed_names.append(file_name)
+                logger.error("Failed to trash %s: %s", request_id, exception)
+
+        for attempt in range(MAX_DELETE_RETRIES):
+            if attempt:
+                time.sleep(2 ** (attempt - 1))  # Exponential backoff before retrying
+            batch = self.google_service.service.new_batch_http_request(callback=on_trashed)
+            for file_id in pending:
+                # Move the file to trash instead of permanent deletion
+                batch.add(
+                    self.google_service.get_file_service().update(fileId=file_id, body={'trashed': True}, fields='id'),
+                    request_id=file_id
+                )
+            batch.execute()
+
+            if not rate_limited:
+                return success_count
+            pending = dict(rate_limited)
+            rate_limited.clear()
+
+        logger.error("Giving up on %d rate-limited deletions", len(pending))
+        failed_names.extend(pending.values())
+        return success_count
 
     def _process_deletion_results(self, success_count: int, total_count: int) -> bool:
         """Process and display the results of batch deletion"""
@@ -339,73 +474,52 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
         return f"✅ Scan complete! Found {duplicate_groups} groups containing {duplicate_files} duplicate files."
 
     def get_file_info(self, file: dict) -> dict:
-        """
-        Get Google Drive file info
-        base has type as str, but Google Drive files are dicts
-        so we need to handle both cases.
-        """
+        """Get Google Drive file info from the listing metadata dict"""
         return get_enriched_file_info(file)
 
     def preview_file(self, file: dict):
         """Preview Google Drive file - only handles preview content, no layout"""
-        if not isinstance(file, dict):
-            st.info("File preview not available for this Google Drive file")
-            return
+        mime_type = file.get('mimeType', '')
 
-        file_info = file
-        file_name = file_info.get('name', 'Unknown')
-        file_id = file_info.get('id', '')
-        mime_type = file_info.get('mimeType', '')
-
-        # Handle different file types
-        if mime_type.startswith('image/'):
-            self._preview_image(file_id, file_name)
-        elif mime_type == 'application/pdf':
-            self._preview_pdf(file_id)
+        # Look up the previewer by exact MIME type, then by its top-level type
+        previewer = self._PREVIEWERS.get(mime_type) or self._PREVIEWERS.get(mime_type.partition('/')[0])
+        if previewer:
+            previewer(self, file)
         else:
             st.info("📁 'Open in Google Drive'")
 
-    def get_file_extra_info(self, file_path: str) -> dict:
-        """Get Google Drive specific extra information for UI display"""
-        if isinstance(file_path, dict):
-            file_info = file_path
-            web_link = file_info.get('webViewLink', '')
-            file_id = file_info.get('id', '')
-            mime_type = file_info.get('mimeType', '')
-
-            extra_info = {
-                'web_link': web_link,
-                'file_id': file_id,
-                'mime_type': mime_type,
-                'links': []
-            }
+    def prefetch_previews(self, files: List[dict]) -> None:
+        """Download media for previewable files in the background and resolve the group's folder paths"""
+        # Prefetching is best-effort: rows resolve whatever is missing themselves, so a failure
+        # here must never keep the results from rendering
+        # Unknown ancestor folders are fetched together rather than one lookup per file row
+        parent_ids = list({file['parents'][0] for file in files if file.get('parents')})
+        if parent_ids:
+            try:
+                self.google_service.get_folder_paths_from_ids(parent_ids)
+            except Exception as e:
+                logger.warning("Could not prefetch folder paths: %s", e)
+
+        file_ids = [
+            file['id'] for file in files
+            if file.get('id') and (file.get('mimeType', '') == 'application/pdf'
+                                   or file.get('mimeType', '').startswith('image/'))
+        ]
+        if file_ids:
+            try:
+                self.google_service.prefetch_media(file_ids)
+            except Exception as e:
+                logger.warning("Could not prefetch previews: %s", e)
 
-            # Add Google Drive link
-            if web_link:
-                extra_info['links'].append({
-                    'text': '🔗 Open in Google Drive',
-                    'url': web_link
-                })
-
-            # Additional viewing options for images
-            if file_id and mime_type.startswith('image/'):
-                # Direct download link
-                download_url = f"https://drive.google.com/uc?id={file_id}&export=download"
-                extra_info['links'].append({
-                    'text': '📥 Download Image',
-                    'url': download_url
-                })
-
-                # Preview link
-                preview_url = f"https://drive.google.com/file/d/{file_id}/view"
-                extra_info['links'].append({
-                    'text': '👁️ Preview in New Tab',
-                    'url': preview_url
-                })
-
-            return extra_info
-
-        return {'links': []}
+    def get_file_extra_info(self, file: dict) -> dict:
+        """Get Google Drive specific extra information for UI display"""
+        view = get_file_view(file)
+        return {
+            'web_link': view.web_link,
+            'file_id': view.file_id,
+            'mime_type': view.mime,
+            'links': [{'text': text, 'url': url} for text, url in view.links]
+        }
 
     def get_file_path(self, file: dict) -> str:
         """Get the formatted file path for Google Drive files"""
@@ -416,40 +530,38 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
         folder_path = self.google_service.get_folder_path_from_id(parent_id)
         return f"/{folder_path}/{file.get('name', 'Unknown')}"
 
-    def _create_image_thumbnail(self, image_data: bytes, file_name: str) -> bool:
-        """Create and display a square thumbnail from image data"""
+    def _create_image_thumbnail(self, file_id: str, version: str, file_name: str) -> bool:
+        """Create and display a square thumbnail for a Drive image"""
         try:
-            thumbnail = get_thumbnail_from_image_data(image_data)
+            thumbnail = _drive_thumbnail(file_id, version, self.google_service)
             st.image(thumbnail, width=250)
             return True
 
         except Exception as e:
             # Fallback to basic display if thumbnail creation fails
+            image_data = self.google_service.get_file_media(file_id=file_id)
             st.image(image_data, caption=f"Preview of {file_name}", width=250)
             logger.warning("⚠️ Could not create thumbnail: %s", e)
             return True
 
-    def _handle_image_download(self, file_id: str, file_name: str) -> bool:
+    def _handle_image_download(self, file_id: str, file_name: str, version: str) -> bool:
         """Download and display image from Google Drive"""
         try:
-            file_content = self.google_service.get_file_media(file_id=file_id)
-            return self._create_image_thumbnail(file_content, file_name)
+            return self._create_image_thumbnail(file_id, version, file_name)
         except Exception as e:
             logger.exception(e)
             return False
 
     def _try_thumbnail_preview(self, file_id: str, file_name: str) -> bool:
-        """Try to display image using Google Drive thumbnail API"""
+        """Try to display the thumbnail Google Drive generated for the image"""
         try:
             st.info("🔄 Trying thumbnail preview...")
-            thumbnail_url = f"https://drive.google.com/thumbnail?id={file_id}&sz=w250"
-
-            response = requests.head(thumbnail_url, timeout=10)
-            if response.status_code == 200:
-                st.image(thumbnail_url, caption=f"Preview of {file_name}", width=250)
-                st.caption("📌 Thumbnail preview")
-                return True
-            return False
+            thumbnail = self.google_service.get_file_media(file_id=file_id, is_thumbnail=True)
+            if not thumbnail:
+                return False
+            st.image(thumbnail, caption=f"Preview of {file_name}", width=250)
+            st.caption("📌 Thumbnail preview")
+            return True
         except Exception:
             return False
 
@@ -460,15 +572,15 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
         st.write("• Click 'Preview in New Tab' for a larger view")
         st.write("• Click 'Download Image' to save locally")
 
-    def _preview_pdf(self, file_id: str):
+    def _preview_pdf(self, file: dict):
         """Handle PDF file preview"""
+        file_id = file.get('id', '')
         if not file_id:
             return
 
         try:
             pdf_content = self.google_service.get_file_media(file_id=file_id)
             if pdf_content:
-                from ...preview import preview_blob_inline
                 preview_blob_inline(pdf_content, 'pdf')
         except Exception as e:
             st.error(f"Error previewing PDF: {str(e)}")
@@ -476,14 +588,17 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
             pdf_embed_url = f"https://drive.google.com/file/d/{file_id}/preview"
             st.markdown(f"**📖 [View PDF]({pdf_embed_url})**")
 
-    def _preview_image(self, file_id: str, file_name: str) -> bool:
+    def _preview_image(self, file: dict) -> bool:
         """Handle image file preview with multiple fallback options"""
+        file_id = file.get('id', '')
+        file_name = file.get('name', 'Unknown')
+        version = file.get('modifiedTime', '')
         if not file_id:
             st.info("📋 Click the links above to view this image in Google Drive")
             return False
 
         # Try direct download first
-        preview_success = self._handle_image_download(file_id, file_name)
+        preview_success = self._handle_image_download(file_id, file_name, version)
 
         # If direct download failed, try thumbnail
         if not preview_success:
@@ -495,6 +610,11 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
 
         return preview_success
 
+    _PREVIEWERS = {
+        'application/pdf': _preview_pdf,
+        'image': _preview_image,
+    }
+
     def make_shortcut(self, source_file: dict, target_file: dict) -> bool:
         """Create a shortcut in Google Drive"""
         if not self.google_service.is_user_authenticated():
@@ -511,6 +631,7 @@ class GoogleDriveProvider(BaseStorageProvider, GoogleAuthenticator):
 
             # Delete target file first
             self.google_service.service.files().delete(fileId=target_id).execute()
+            self._clear_scan_cache()
 
             # Create shortcut
             shortcut_metadata = {
@@ -3,6 +3,7 @@
 import os
 import hashlib
 import logging
+from collections import defaultdict
 from typing import Dict, List, Union
 import streamlit as st
 
@@ -131,7 +132,11 @@ class LocalFileSystemProvider(BaseStorageProvider):
         if not folder_path or not os.path.exists(folder_path):
             return {}
 
-        file_dict: dict[str, list[dict]] = {}
+        # Compare sizes in bytes; the KB bounds are converted once per scan
+        min_size_bytes = filters.min_size_kb * 1024
+        max_size_bytes = filters.max_size_kb * 1024 if filters.max_size_kb > 0 else None
+
+        file_dict: defaultdict[str, list[dict]] = defaultdict(list)
         for root, _, files in os.walk(folder_path):
             for file in files:
                 file_path = os.path.join(root, file)
@@ -146,10 +151,10 @@ class LocalFileSystemProvider(BaseStorageProvider):
 
                 # Check file size
                 try:
-                    file_size = os.path.getsize(file_path) / 1024  # Convert to KB
-                    if file_size < filters.min_size_kb:
+                    file_size = os.path.getsize(file_path)
+                    if file_size < min_size_bytes:
                         continue
-                    if filters.max_size_kb > 0 and file_size > filters.max_size_kb:
+                    if max_size_bytes is not None and file_size > max_size_bytes:
                         continue
                 except OSError:
                     continue
@@ -157,8 +162,6 @@ class LocalFileSystemProvider(BaseStorageProvider):
                 # Add to duplicates if it passes all filters
                 file_hash = self.get_file_hash(file_path)
                 if file_hash:
-                    if file_hash not in file_dict:
-                        file_dict[file_hash] = []
                     file_dict[file_hash].append({'path': file_path, 'id': file_path})
 
         return {k: v for k, v in file_dict.items() if len(v) > 1}
@@ -150,6 +150,9 @@ class DuplicateFinderUI:
         expander_header = f"🗂️ Duplicate Group {group_idx + 1} - {total_files_in_group} files ({group_size} each) | 💾 Total wasted space: {wasted_space}"
 
         with st.expander(expander_header, expanded=True):
+            # Let slow previews load in the background while earlier rows render
+            storage_provider.prefetch_previews(files)
+
             # Create DataFrame for organization
             file_data = []
             for file_idx, file in enumerate(files, 1):
@@ -179,7 +182,7 @@ class DuplicateFinderUI:
 
             with col1:
                 st.badge(f"📄 File #{file_idx}")
-                selected = st.checkbox(f"Delete this file", key=f"delete-{file}")
+                selected = st.checkbox(f"Delete this file", key=f"delete-{file['id']}")
 
             with col2:
                 storage_provider.preview_file(file)
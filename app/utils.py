@@ -1,22 +1,25 @@
 """Utility functions for the application."""
+import functools
 import io
 import os
 from datetime import datetime
 
-from PIL import Image
+from PIL import Image, ImageOps
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+REDUCIBLE_IMAGE_MODES = ('L', 'LA', 'RGB', 'RGBA')  # Modes Image.reduce averages correctly
+THUMBNAIL_IMAGE_MODES = ('L', 'RGB', 'RGBA')  # Modes thumbnails are resized and saved in
 
 
 def human_readable_size(size_in_bytes, upto_unit=None):
     """Convert bytes to a human-readable format, optionally up to a specified unit (e.g., 'MB')."""
     size_in_bytes = float(size_in_bytes)
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    for unit in units:
-        if upto_unit and unit == upto_unit:
-            return f"{size_in_bytes:.2f} {unit}"
-        if size_in_bytes < 1024:
-            return f"{size_in_bytes:.2f} {unit}"
-        size_in_bytes /= 1024
-    return f"{size_in_bytes:.2f} {units[-1]}"
+    # Each unit step is 10 bits, so the bit length picks the unit without a division loop
+    shift = (int(size_in_bytes).bit_length() - 1) // 10 if size_in_bytes >= 1 else 0
+    shift = min(shift, len(SIZE_UNITS) - 1)
+    if upto_unit in SIZE_UNITS:
+        shift = min(shift, SIZE_UNITS.index(upto_unit))
+    return f"{size_in_bytes / (1 << (shift * 10)):.2f} {SIZE_UNITS[shift]}"
 
 
 def format_timestamp(timestamp):
@@ -40,6 +43,7 @@ def get_file_info(file_path):
     }
 
 
+@functools.lru_cache(maxsize=4096)
 def get_file_extension(filename: str) -> str:
     """Extract file extension from filename"""
     if '.' in filename:
@@ -47,10 +51,15 @@ def get_file_extension(filename: str) -> str:
     return ''
 
 
+@functools.lru_cache(maxsize=8192)
 def format_iso_timestamp(timestamp: str, default: str = 'Unknown') -> str:
-    """Format ISO timestamp to readable format"""
+    """Format ISO timestamp to readable format; memoised as timestamps repeat across reruns"""
     if not timestamp:
         return default
+    # Drive returns RFC 3339 UTC times (YYYY-MM-DDTHH:MM:SS.sssZ); slice those directly
+    if (len(timestamp) >= 20 and timestamp[-1] == 'Z' and timestamp[10] == 'T'
+            and timestamp[4] == timestamp[7] == '-' and timestamp[13] == timestamp[16] == ':'):
+        return f"{timestamp[:10]} {timestamp[11:19]}"
     try:
         dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
         return dt.strftime('%Y-%m-%d %H:%M:%S')
@@ -60,26 +69,33 @@ def format_iso_timestamp(timestamp: str, default: str = 'Unknown') -> str:
 
 def get_thumbnail_from_image_data(image_data: bytes, *, width:int = 250, height: int = 250):
     image: Image.Image = Image.open(io.BytesIO(image_data))
-
-    # Create a square thumbnail
-    thumbnail_size = (width, height)
-    width, height = image.size
-
-    # Crop to square if needed
-    if width != height:
-        min_dimension = min(width, height)
-        left = (width - min_dimension) // 2
-        top = (height - min_dimension) // 2
-        right = left + min_dimension
-        bottom = top + min_dimension
-        image = image.crop((left, top, right, bottom))
-
-    # Create thumbnail
-    image.thumbnail(thumbnail_size, Image.Resampling.LANCZOS)
+    # Derived images have no format, so remember the source's for saving the thumbnail
+    source_format = image.format
+
+    # Let libjpeg downscale while decoding; the result stays at least twice the thumbnail size
+    if source_format == 'JPEG':
+        image.draft('RGB', (width * 2, height * 2))
+
+    # CMYK, palette and other modes cannot be resampled well or saved as PNG
+    if image.mode not in THUMBNAIL_IMAGE_MODES:
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha and source_format != 'JPEG' else 'RGB')
+
+    if source_format != 'JPEG' and image.mode in REDUCIBLE_IMAGE_MODES:
+        # Other formats decode at full size; box-reduce by a power of two before the LANCZOS pass
+        factor = 1
+        while min(image.size) // (factor * 2) >= max(width, height) * 2:
+            factor *= 2
+        if factor > 1:
+            image = image.reduce(factor)
+
+    # Center-crop to a square and resize in one pass, never upscaling past the source
+    side = min(image.width, image.height, width, height)
+    image = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS, centering=(0.5, 0.5))
 
     # Save thumbnail
     thumbnail_buffer = io.BytesIO()
-    format_type = image.format if image.format else 'PNG'
+    format_type = 'JPEG' if source_format == 'JPEG' else 'PNG'
     image.save(thumbnail_buffer, format=format_type)
 
     # Display